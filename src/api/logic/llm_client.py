@@ -9,13 +9,14 @@ Supports three provider types:
 Provider names are normalized to handle legacy values from database.
 """
 
-import json
 import logging
+import re
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import Any
 
 import httpx
+import orjson
 
 from api.logic.claude_cli_provider import (
     ClaudeCliConfig,
@@ -78,6 +79,47 @@ def normalize_provider(provider: str) -> str:
     raise ValueError(f"Unknown LLM provider: {provider}")
 
 
+# Connection pool shared by all streaming requests: keep-alive connections are
+# reused (and multiplexed over HTTP/2) instead of paying a TLS handshake per chat
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+_CONNECT_TIMEOUT_SECONDS = 5.0
+
+# SSE framing, matched against raw bytes so filtered lines are never decoded.
+# Per the SSE spec the space after "data:" is optional.
+_SSE_DATA_LINE = re.compile(rb"data: ?(.*)", re.DOTALL)
+_SSE_DONE_SENTINEL = b"[DONE]"
+_SSE_READ_CHUNK_SIZE = 64 * 1024
+
+
+async def _aiter_sse_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+    """
+    Yield raw SSE lines from a streaming HTTP response.
+
+    Reads large chunks and splits them with bytes.split (a memchr scan in C);
+    only the unterminated tail of a chunk is carried over to the next one,
+    so parsing stays linear in the stream length.
+
+    Args:
+        response: Open streaming response.
+
+    Yields:
+        Lines without the trailing line terminator.
+    """
+    pending = bytearray()
+    async for chunk in response.aiter_bytes(_SSE_READ_CHUNK_SIZE):
+        lines = chunk.split(b"\n")
+        if len(lines) == 1:
+            pending += chunk
+            continue
+        pending += lines[0]
+        yield bytes(pending).rstrip(b"\r")
+        for line in lines[1:-1]:
+            yield line.rstrip(b"\r")
+        pending = bytearray(lines[-1])
+    if pending:
+        yield bytes(pending).rstrip(b"\r")
+
+
 @dataclass
 class LLMConfig:
     """LLM configuration from database."""
@@ -99,6 +141,62 @@ class ChatMessage:
     content: str
 
 
+def _build_openai_body(config: LLMConfig, messages: list[ChatMessage]) -> bytes:
+    """
+    Serialize an OpenAI-compatible chat completion request.
+
+    Args:
+        config: LLM configuration.
+        messages: Chat messages for context.
+
+    Returns:
+        JSON request body, ready to send as raw content.
+    """
+    return orjson.dumps(
+        {
+            "model": config.model_id,
+            "messages": [{"role": m.role, "content": m.content} for m in messages],
+            "max_tokens": config.max_tokens,
+            "temperature": config.temperature,
+            "stream": True,
+        }
+    )
+
+
+def _build_anthropic_body(config: LLMConfig, messages: list[ChatMessage]) -> bytes:
+    """
+    Serialize an Anthropic Messages API request.
+
+    System messages are lifted into the top-level ``system`` field.
+
+    Args:
+        config: LLM configuration.
+        messages: Chat messages for context.
+
+    Returns:
+        JSON request body, ready to send as raw content.
+    """
+    system_message = ""
+    anthropic_messages = []
+    for m in messages:
+        if m.role == "system":
+            system_message = m.content
+        else:
+            anthropic_messages.append({"role": m.role, "content": m.content})
+
+    payload: dict[str, Any] = {
+        "model": config.model_id,
+        "messages": anthropic_messages,
+        "max_tokens": config.max_tokens,
+        "temperature": config.temperature,
+        "stream": True,
+    }
+    if system_message:
+        payload["system"] = system_message
+
+    return orjson.dumps(payload)
+
+
 class LLMClient:
     """
     Async HTTP client for LLM providers.
@@ -137,7 +235,9 @@ class LLMClient:
         """Get or create HTTP client."""
         if self._client is None:
             self._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(self._timeout),
+                timeout=httpx.Timeout(self._timeout, connect=_CONNECT_TIMEOUT_SECONDS),
+                limits=_HTTP_LIMITS,
+                http2=True,
                 follow_redirects=True,
             )
         return self._client
@@ -202,13 +302,7 @@ class LLMClient:
         if config.api_key:
             headers["Authorization"] = f"Bearer {config.api_key}"
 
-        payload = {
-            "model": config.model_id,
-            "messages": [{"role": m.role, "content": m.content} for m in messages],
-            "max_tokens": config.max_tokens,
-            "temperature": config.temperature,
-            "stream": True,
-        }
+        body = _build_openai_body(config, messages)
 
         logger.info(
             "🤖 Streaming from %s (%s)",
@@ -220,7 +314,7 @@ class LLMClient:
             async with client.stream(
                 "POST",
                 endpoint,
-                json=payload,
+                content=body,
                 headers=headers,
             ) as response:
                 if response.status_code != 200:
@@ -232,18 +326,21 @@ class LLMClient:
                     )
                     raise ServiceUnavailableError(f"LLM ({config.provider})")
 
-                async for line in response.aiter_lines():
-                    if not line or line == "data: [DONE]":
+                async for line in _aiter_sse_lines(response):
+                    match = _SSE_DATA_LINE.match(line)
+                    if match is None:
+                        continue
+                    event_data = match.group(1)
+                    if event_data == _SSE_DONE_SENTINEL:
+                        continue
+                    try:
+                        data = orjson.loads(event_data)
+                        delta = data.get("choices", [{}])[0].get("delta", {})
+                        content = delta.get("content", "")
+                        if content:
+                            yield content
+                    except orjson.JSONDecodeError:
                         continue
-                    if line.startswith("data: "):
-                        try:
-                            data = json.loads(line[6:])
-                            delta = data.get("choices", [{}])[0].get("delta", {})
-                            content = delta.get("content", "")
-                            if content:
-                                yield content
-                        except json.JSONDecodeError:
-                            continue
 
         except httpx.HTTPError as e:
             logger.error(f"❌ HTTP error calling LLM: {e}")
@@ -268,24 +365,7 @@ class LLMClient:
         if config.api_key:
             headers["x-api-key"] = config.api_key
 
-        # Convert messages to Anthropic format
-        system_message = ""
-        anthropic_messages = []
-        for m in messages:
-            if m.role == "system":
-                system_message = m.content
-            else:
-                anthropic_messages.append({"role": m.role, "content": m.content})
-
-        payload: dict[str, Any] = {
-            "model": config.model_id,
-            "messages": anthropic_messages,
-            "max_tokens": config.max_tokens,
-            "temperature": config.temperature,
-            "stream": True,
-        }
-        if system_message:
-            payload["system"] = system_message
+        body = _build_anthropic_body(config, messages)
 
         logger.info(f"🤖 Streaming from Anthropic ({config.model_id})")
 
@@ -293,7 +373,7 @@ class LLMClient:
             async with client.stream(
                 "POST",
                 endpoint,
-                json=payload,
+                content=body,
                 headers=headers,
             ) as response:
                 if response.status_code != 200:
@@ -305,20 +385,20 @@ class LLMClient:
                     )
                     raise ServiceUnavailableError("LLM (anthropic)")
 
-                async for line in response.aiter_lines():
-                    if not line:
+                async for line in _aiter_sse_lines(response):
+                    match = _SSE_DATA_LINE.match(line)
+                    if match is None:
+                        continue
+                    try:
+                        data = orjson.loads(match.group(1))
+                        event_type = data.get("type", "")
+                        if event_type == "content_block_delta":
+                            delta = data.get("delta", {})
+                            text = delta.get("text", "")
+                            if text:
+                                yield text
+                    except orjson.JSONDecodeError:
                         continue
-                    if line.startswith("data: "):
-                        try:
-                            data = json.loads(line[6:])
-                            event_type = data.get("type", "")
-                            if event_type == "content_block_delta":
-                                delta = data.get("delta", {})
-                                text = delta.get("text", "")
-                                if text:
-                                    yield text
-                        except json.JSONDecodeError:
-                            continue
 
         except httpx.HTTPError as e:
             logger.error(f"❌ HTTP error calling Anthropic: {e}")
@@ -11,9 +11,12 @@ Runs asynchronously and pushes scores to Langfuse traces.
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import itertools
 import logging
+import math
 import os
-import random
 import time
 from dataclasses import dataclass
 from typing import Any
@@ -33,6 +36,9 @@ logger = logging.getLogger(__name__)
 # Default sample rate (fraction of requests to evaluate)
 _DEFAULT_SAMPLE_RATE = 0.1
 
+# Distinct judge configurations (endpoint/model/key) kept warm at once
+_JUDGE_CACHE_SIZE = 8
+
 
 @dataclass
 class EvalResult:
@@ -51,13 +57,36 @@ class EvalResult:
     context_precision: float | None = None
 
 
+# Parsed API_RAGAS_SAMPLE_RATE, read once per process
+_sample_rate: float | None = None
+
+# Requests seen by _should_evaluate(), drives deterministic sampling
+_sample_counter = itertools.count()
+
+
 def _get_sample_rate() -> float:
     """
     Get the configured RAGAS sample rate.
 
+    The environment variable is parsed on first use and cached, since
+    this runs on every chat request.
+
     Returns:
         Float between 0.0 and 1.0 representing evaluation probability.
     """
+    global _sample_rate
+    if _sample_rate is None:
+        _sample_rate = _parse_sample_rate()
+    return _sample_rate
+
+
+def _parse_sample_rate() -> float:
+    """
+    Parse and clamp API_RAGAS_SAMPLE_RATE.
+
+    Returns:
+        Float between 0.0 and 1.0, or the default if unset or invalid.
+    """
     try:
         rate = float(os.getenv("API_RAGAS_SAMPLE_RATE", str(_DEFAULT_SAMPLE_RATE)))
         return max(0.0, min(1.0, rate))
@@ -65,14 +94,32 @@ def _get_sample_rate() -> float:
         return _DEFAULT_SAMPLE_RATE
 
 
+def _reset_sample_rate_cache() -> None:
+    """Drop the cached sample rate so the next call re-reads the environment."""
+    global _sample_rate
+    _sample_rate = None
+
+
 def _should_evaluate() -> bool:
     """
     Determine if this request should be evaluated based on sample rate.
 
+    Uses a per-process request counter instead of a random draw: request n
+    is evaluated when floor((n + 1) * rate) exceeds floor(n * rate), so any
+    rate is honoured exactly and samples are spread evenly (0.1 evaluates
+    every 10th request, 0.4 evaluates 4 of every 10). This keeps the sampled
+    density even during low-traffic periods.
+
     Returns:
         True if the request should be evaluated.
     """
-    return random.random() < _get_sample_rate()
+    rate = _get_sample_rate()
+    if rate <= 0.0:
+        return False
+    if rate >= 1.0:
+        return True
+    n = next(_sample_counter)
+    return math.floor((n + 1) * rate) > math.floor(n * rate)
 
 
 async def maybe_evaluate_async(
@@ -117,6 +164,33 @@ async def maybe_evaluate_async(
         return None
 
 
+@functools.lru_cache(maxsize=1)
+def _load_ragas() -> tuple[Any, Any, Any, Any] | None:
+    """
+    Import the RAGAS sample and metric classes once per process.
+
+    Returns:
+        (SingleTurnSample, Faithfulness, LLMContextPrecisionWithoutReference,
+        ResponseRelevancy), or None if the ragas package is not installed.
+    """
+    try:
+        from ragas.dataset_schema import SingleTurnSample
+        from ragas.metrics import (
+            Faithfulness,
+            LLMContextPrecisionWithoutReference,
+            ResponseRelevancy,
+        )
+    except ImportError:
+        return None
+
+    return (
+        SingleTurnSample,
+        Faithfulness,
+        LLMContextPrecisionWithoutReference,
+        ResponseRelevancy,
+    )
+
+
 async def _run_evaluation(
     trace_id: str,
     query: str,
@@ -137,18 +211,19 @@ async def _run_evaluation(
     Returns:
         EvalResult with computed scores.
     """
-    try:
-        from ragas.dataset_schema import SingleTurnSample
-        from ragas.metrics import (
-            Faithfulness,
-            LLMContextPrecisionWithoutReference,
-            ResponseRelevancy,
-        )
-    except ImportError:
+    ragas_classes = _load_ragas()
+    if ragas_classes is None:
         logger.warning("⚠️ RAGAS package not installed, skipping evaluation")
         ragas_evaluations_total.labels(status="skipped").inc()
         return EvalResult(trace_id=trace_id)
 
+    (
+        SingleTurnSample,
+        Faithfulness,
+        LLMContextPrecisionWithoutReference,
+        ResponseRelevancy,
+    ) = ragas_classes
+
     # Build sample
     sample = SingleTurnSample(
         user_input=query,
@@ -162,7 +237,7 @@ async def _run_evaluation(
     llm_wrapper = _get_ragas_llm(llm_config)
     embeddings_wrapper = _get_ragas_embeddings(llm_config)
 
-    # Run each metric individually for partial failure tolerance
+    # Each metric is scored independently for partial failure tolerance
     metrics_to_run: list[tuple[str, Any]] = [
         ("faithfulness", Faithfulness(llm=llm_wrapper)),
         ("context_precision", LLMContextPrecisionWithoutReference(llm=llm_wrapper)),
@@ -183,25 +258,27 @@ async def _run_evaluation(
 
     start_time = time.monotonic()
 
-    for metric_name, metric in metrics_to_run:
-        try:
-            score = await metric.single_turn_ascore(sample)
-            score_float = float(score) if score is not None else None
-
-            if score_float is not None:
-                setattr(result, metric_name, score_float)
-                _push_score(trace_id, metric_name, score_float)
-                # Record in Prometheus histogram
-                if metric_name in _prom_histograms:
-                    _prom_histograms[metric_name].observe(score_float)
-                logger.debug(
-                    f"📊 RAGAS {metric_name}={score_float:.3f} for trace {trace_id}"
-                )
-
-        except Exception as e:
-            logger.warning(
-                f"⚠️ RAGAS metric {metric_name} failed for trace {trace_id}: {e}"
-            )
+    # Judge calls are independent, so run them concurrently
+    scores = await asyncio.gather(
+        *(
+            _score_metric(trace_id, metric_name, metric, sample)
+            for metric_name, metric in metrics_to_run
+        )
+    )
+
+    computed: dict[str, float] = {}
+    for (metric_name, _), score_float in zip(metrics_to_run, scores):
+        if score_float is None:
+            continue
+        setattr(result, metric_name, score_float)
+        computed[metric_name] = score_float
+        # Record in Prometheus histogram
+        if metric_name in _prom_histograms:
+            _prom_histograms[metric_name].observe(score_float)
+        logger.debug(f"📊 RAGAS {metric_name}={score_float:.3f} for trace {trace_id}")
+
+    # Push each successful metric to Langfuse as its own score
+    _push_scores(trace_id, computed)
 
     duration = time.monotonic() - start_time
     ragas_evaluation_duration.observe(duration)
@@ -226,21 +303,42 @@ async def _run_evaluation(
     return result
 
 
-def _push_score(trace_id: str, name: str, value: float) -> None:
+async def _score_metric(
+    trace_id: str,
+    metric_name: str,
+    metric: Any,
+    sample: Any,
+) -> float | None:
+    """
+    Score a single RAGAS metric, swallowing failures.
+
+    Args:
+        trace_id: Langfuse trace ID (for logging).
+        metric_name: Metric name (for logging).
+        metric: RAGAS metric instance.
+        sample: RAGAS SingleTurnSample.
+
+    Returns:
+        The score as a float, or None if it failed or returned nothing.
+    """
+    try:
+        score = await metric.single_turn_ascore(sample)
+        return float(score) if score is not None else None
+    except Exception as e:
+        logger.warning(f"⚠️ RAGAS metric {metric_name} failed for trace {trace_id}: {e}")
+        return None
+
+
+def _push_scores(trace_id: str, scores: dict[str, float]) -> None:
     """
-    Push a numeric score to Langfuse.
+    Push computed metric scores to Langfuse, one score per metric.
 
     Args:
         trace_id: Langfuse trace ID.
-        name: Score name.
-        value: Score value (0.0 - 1.0).
+        scores: Mapping of metric name to score value (0.0 - 1.0).
     """
-    score_trace(
-        trace_id=trace_id,
-        name=name,
-        value=value,
-        comment=f"RAGAS {name} (automated)",
-    )
+    for name, value in scores.items():
+        score_trace(trace_id, name, value, comment=f"RAGAS {name} (automated)")
 
 
 def _get_ragas_llm(llm_config: dict[str, Any] | None = None) -> Any:
@@ -254,10 +352,8 @@ def _get_ragas_llm(llm_config: dict[str, Any] | None = None) -> Any:
         llm_config: Optional LLM config from database.
 
     Returns:
-        RAGAS LLM wrapper instance.
+        RAGAS LLM wrapper instance, shared by every trace using the same judge.
     """
-    from ragas.llms import LangchainLLMWrapper
-
     # Priority: env vars > llm_config > defaults
     endpoint = os.getenv("API_RAGAS_EVAL_LLM_ENDPOINT")
     model_id = os.getenv("API_RAGAS_EVAL_LLM_MODEL")
@@ -275,7 +371,27 @@ def _get_ragas_llm(llm_config: dict[str, Any] | None = None) -> Any:
     if not model_id:
         model_id = "gpt-4o-mini"
 
+    return _build_ragas_llm(endpoint, model_id, api_key)
+
+
+@functools.lru_cache(maxsize=_JUDGE_CACHE_SIZE)
+def _build_ragas_llm(endpoint: str, model_id: str, api_key: str | None) -> Any:
+    """
+    Build a RAGAS LLM wrapper once per judge configuration.
+
+    Sampled traces for the same judge reuse one ChatOpenAI client and its
+    connection pool instead of opening new connections per evaluation.
+
+    Args:
+        endpoint: OpenAI-compatible base URL.
+        model_id: Judge model name.
+        api_key: API key, if any.
+
+    Returns:
+        RAGAS LLM wrapper instance.
+    """
     from langchain_openai import ChatOpenAI
+    from ragas.llms import LangchainLLMWrapper
 
     llm = ChatOpenAI(
         model=model_id,
@@ -298,8 +414,6 @@ def _get_ragas_embeddings(llm_config: dict[str, Any] | None = None) -> Any:
         RAGAS embeddings wrapper or None if unavailable.
     """
     try:
-        from ragas.embeddings import LangchainEmbeddingsWrapper
-
         endpoint = os.getenv("API_RAGAS_EVAL_LLM_ENDPOINT")
         api_key = os.getenv("API_RAGAS_EVAL_LLM_API_KEY")
 
@@ -310,15 +424,31 @@ def _get_ragas_embeddings(llm_config: dict[str, Any] | None = None) -> Any:
         if not endpoint:
             endpoint = "https://api.openai.com/v1"
 
-        from langchain_openai import OpenAIEmbeddings
-
-        embeddings = OpenAIEmbeddings(
-            openai_api_base=endpoint,
-            openai_api_key=api_key or "no-key",
-        )
-
-        return LangchainEmbeddingsWrapper(embeddings)
+        return _build_ragas_embeddings(endpoint, api_key)
 
     except Exception as e:
         logger.warning(f"⚠️ Could not create RAGAS embeddings wrapper: {e}")
         return None
+
+
+@functools.lru_cache(maxsize=_JUDGE_CACHE_SIZE)
+def _build_ragas_embeddings(endpoint: str, api_key: str | None) -> Any:
+    """
+    Build a RAGAS embeddings wrapper once per endpoint and key.
+
+    Args:
+        endpoint: OpenAI-compatible base URL.
+        api_key: API key, if any.
+
+    Returns:
+        RAGAS embeddings wrapper instance.
+    """
+    from langchain_openai import OpenAIEmbeddings
+    from ragas.embeddings import LangchainEmbeddingsWrapper
+
+    embeddings = OpenAIEmbeddings(
+        openai_api_base=endpoint,
+        openai_api_key=api_key or "no-key",
+    )
+
+    return LangchainEmbeddingsWrapper(embeddings)
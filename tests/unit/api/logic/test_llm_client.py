@@ -1,8 +1,10 @@
 """Unit tests for LLMClient."""
 
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
 
 from api.logic.claude_cli_provider import (
@@ -17,114 +19,132 @@ from api.logic.llm_client import (
     LLMClient,
     LLMConfig,
     PROVIDER_ALIASES,
+    _HTTP_LIMITS,
+    _aiter_sse_lines,
+    _build_anthropic_body,
+    _build_openai_body,
     normalize_provider,
 )
 
 
-class TestProviderNormalization:
-    """Tests for normalize_provider() and PROVIDER_ALIASES."""
-
-    # Test canonical names pass through unchanged
-    @pytest.mark.parametrize(
-        "provider,expected",
-        [
-            ("openai-compatible", "openai-compatible"),
-            ("anthropic", "anthropic"),
-            ("anthropic-token", "anthropic-token"),
-        ],
-    )
-    def test_canonical_names(self, provider: str, expected: str) -> None:
-        """Test canonical provider names pass through unchanged."""
-        assert normalize_provider(provider) == expected
-
-    # Test legacy TGI values
-    @pytest.mark.parametrize(
-        "provider",
-        ["tgi", "TGI", "Tgi", "llm_provider_tgi", "LLM_PROVIDER_TGI"],
-    )
-    def test_legacy_tgi_normalizes_to_openai_compatible(self, provider: str) -> None:
-        """Test legacy TGI provider values normalize to openai-compatible."""
-        assert normalize_provider(provider) == "openai-compatible"
-
-    # Test legacy vLLM values
-    @pytest.mark.parametrize(
-        "provider",
-        ["vllm", "VLLM", "vLLM", "llm_provider_vllm", "LLM_PROVIDER_VLLM"],
-    )
-    def test_legacy_vllm_normalizes_to_openai_compatible(self, provider: str) -> None:
-        """Test legacy vLLM provider values normalize to openai-compatible."""
-        assert normalize_provider(provider) == "openai-compatible"
-
-    # Test legacy OpenAI values
-    @pytest.mark.parametrize(
-        "provider",
-        ["openai", "OPENAI", "OpenAI", "llm_provider_openai", "LLM_PROVIDER_OPENAI"],
-    )
-    def test_legacy_openai_normalizes_to_openai_compatible(self, provider: str) -> None:
-        """Test legacy OpenAI provider values normalize to openai-compatible."""
-        assert normalize_provider(provider) == "openai-compatible"
+class _FakeStreamResponse:
+    """Minimal stand-in for a streaming httpx.Response."""
 
-    # Test legacy Ollama values
-    @pytest.mark.parametrize(
-        "provider",
-        ["ollama", "OLLAMA", "Ollama", "llm_provider_ollama", "LLM_PROVIDER_OLLAMA"],
-    )
-    def test_legacy_ollama_normalizes_to_openai_compatible(self, provider: str) -> None:
-        """Test legacy Ollama provider values normalize to openai-compatible."""
-        assert normalize_provider(provider) == "openai-compatible"
-
-    # Test underscore variants of openai-compatible
-    @pytest.mark.parametrize(
-        "provider",
-        [
-            "openai_compatible",
-            "OPENAI_COMPATIBLE",
-            "llm_provider_openai_compatible",
-            "LLM_PROVIDER_OPENAI_COMPATIBLE",
-        ],
-    )
-    def test_openai_compatible_underscore_variants(self, provider: str) -> None:
-        """Test underscore variants of openai-compatible normalize correctly."""
-        assert normalize_provider(provider) == "openai-compatible"
+    def __init__(
+        self,
+        status_code: int,
+        frames: tuple[bytes, ...] = (),
+        body: bytes = b"",
+    ) -> None:
+        self.status_code = status_code
+        self.chunk_size: int | None = None
+        self._frames = frames
+        self._body = body
+
+    async def aiter_bytes(self, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+        """Yield the configured raw frames, recording the requested chunk size."""
+        self.chunk_size = chunk_size
+        for frame in self._frames:
+            yield frame
+
+    async def aread(self) -> bytes:
+        """Return the configured error body."""
+        return self._body
+
+
+class _FakeStreamContext:
+    """Async context manager returned by _FakeHttpClient.stream()."""
+
+    def __init__(self, response: _FakeStreamResponse) -> None:
+        self._response = response
+
+    async def __aenter__(self) -> _FakeStreamResponse:
+        return self._response
+
+    async def __aexit__(self, *exc_info: object) -> bool:
+        return False
+
+
+class _FakeHttpClient:
+    """Minimal stand-in for httpx.AsyncClient that records stream() calls."""
+
+    def __init__(self, response: _FakeStreamResponse) -> None:
+        self.calls: list[tuple[str, str, dict]] = []
+        self._response = response
+
+    def stream(self, method: str, url: str, **kwargs: object) -> _FakeStreamContext:
+        """Record the request and return a context yielding the fake response."""
+        self.calls.append((method, url, kwargs))
+        return _FakeStreamContext(self._response)
+
+
+# (input, expected, family) triples for normalize_provider()
+_NORMALIZE_CASES: list[tuple[str, str, str]] = [
+    # Canonical names pass through unchanged
+    ("openai-compatible", "openai-compatible", "canonical"),
+    ("anthropic", "anthropic", "canonical"),
+    ("anthropic-token", "anthropic-token", "canonical"),
+    # Legacy TGI
+    ("tgi", "openai-compatible", "tgi"),
+    ("TGI", "openai-compatible", "tgi"),
+    ("Tgi", "openai-compatible", "tgi"),
+    ("llm_provider_tgi", "openai-compatible", "tgi"),
+    ("LLM_PROVIDER_TGI", "openai-compatible", "tgi"),
+    # Legacy vLLM
+    ("vllm", "openai-compatible", "vllm"),
+    ("VLLM", "openai-compatible", "vllm"),
+    ("vLLM", "openai-compatible", "vllm"),
+    ("llm_provider_vllm", "openai-compatible", "vllm"),
+    ("LLM_PROVIDER_VLLM", "openai-compatible", "vllm"),
+    # Legacy OpenAI
+    ("openai", "openai-compatible", "openai"),
+    ("OPENAI", "openai-compatible", "openai"),
+    ("OpenAI", "openai-compatible", "openai"),
+    ("llm_provider_openai", "openai-compatible", "openai"),
+    ("LLM_PROVIDER_OPENAI", "openai-compatible", "openai"),
+    # Legacy Ollama
+    ("ollama", "openai-compatible", "ollama"),
+    ("OLLAMA", "openai-compatible", "ollama"),
+    ("Ollama", "openai-compatible", "ollama"),
+    ("llm_provider_ollama", "openai-compatible", "ollama"),
+    ("LLM_PROVIDER_OLLAMA", "openai-compatible", "ollama"),
+    # Underscore variants of openai-compatible
+    ("openai_compatible", "openai-compatible", "openai-compatible"),
+    ("OPENAI_COMPATIBLE", "openai-compatible", "openai-compatible"),
+    ("llm_provider_openai_compatible", "openai-compatible", "openai-compatible"),
+    ("LLM_PROVIDER_OPENAI_COMPATIBLE", "openai-compatible", "openai-compatible"),
+    # Anthropic API
+    ("ANTHROPIC", "anthropic", "anthropic"),
+    ("llm_provider_anthropic", "anthropic", "anthropic"),
+    ("LLM_PROVIDER_ANTHROPIC", "anthropic", "anthropic"),
+    # Anthropic Token
+    ("ANTHROPIC-TOKEN", "anthropic-token", "anthropic-token"),
+    ("anthropic_token", "anthropic-token", "anthropic-token"),
+    ("ANTHROPIC_TOKEN", "anthropic-token", "anthropic-token"),
+    ("llm_provider_anthropic_token", "anthropic-token", "anthropic-token"),
+    ("LLM_PROVIDER_ANTHROPIC_TOKEN", "anthropic-token", "anthropic-token"),
+    # Whitespace is stripped before normalization
+    ("  openai  ", "openai-compatible", "whitespace"),
+    ("\tanthropic\n", "anthropic", "whitespace"),
+    ("  anthropic-token  ", "anthropic-token", "whitespace"),
+    (" tgi ", "openai-compatible", "whitespace"),
+]
+
+# Pre-sanitized test ids so pytest does not escape raw whitespace inputs
+_NORMALIZE_IDS: list[str] = [
+    f"{family}-{provider.strip()}" for provider, _, family in _NORMALIZE_CASES
+]
 
-    # Test Anthropic API values
-    @pytest.mark.parametrize(
-        "provider",
-        ["anthropic", "ANTHROPIC", "llm_provider_anthropic", "LLM_PROVIDER_ANTHROPIC"],
-    )
-    def test_anthropic_api_normalizes_correctly(self, provider: str) -> None:
-        """Test Anthropic API provider values normalize correctly."""
-        assert normalize_provider(provider) == "anthropic"
 
-    # Test Anthropic Token values
-    @pytest.mark.parametrize(
-        "provider",
-        [
-            "anthropic-token",
-            "ANTHROPIC-TOKEN",
-            "anthropic_token",
-            "ANTHROPIC_TOKEN",
-            "llm_provider_anthropic_token",
-            "LLM_PROVIDER_ANTHROPIC_TOKEN",
-        ],
-    )
-    def test_anthropic_token_normalizes_correctly(self, provider: str) -> None:
-        """Test Anthropic Token provider values normalize correctly."""
-        assert normalize_provider(provider) == "anthropic-token"
+class TestProviderNormalization:
+    """Tests for normalize_provider() and PROVIDER_ALIASES."""
 
-    # Test whitespace handling
     @pytest.mark.parametrize(
-        "provider,expected",
-        [
-            ("  openai  ", "openai-compatible"),
-            ("\tanthropic\n", "anthropic"),
-            ("  anthropic-token  ", "anthropic-token"),
-            (" tgi ", "openai-compatible"),
-        ],
+        "provider,expected,family", _NORMALIZE_CASES, ids=_NORMALIZE_IDS
     )
-    def test_whitespace_handling(self, provider: str, expected: str) -> None:
-        """Test that whitespace is stripped before normalization."""
-        assert normalize_provider(provider) == expected
+    def test_normalize(self, provider: str, expected: str, family: str) -> None:
+        """Test provider values normalize to their canonical name."""
+        assert normalize_provider(provider) == expected, f"{family}: {provider!r}"
 
     # Test unknown provider raises ValueError
     def test_unknown_provider_raises_value_error(self) -> None:
@@ -178,6 +198,118 @@ class TestProviderNormalization:
             assert canonical in canonical_names, f"Alias '{alias}' maps to non-canonical '{canonical}'"
 
 
+class TestAiterSseLines:
+    """Tests for the _aiter_sse_lines() byte splitter."""
+
+    @staticmethod
+    async def _collect(*chunks: bytes) -> list[bytes]:
+        """Feed chunks through the splitter and collect the lines."""
+        response = _FakeStreamResponse(200, frames=chunks)
+        return [line async for line in _aiter_sse_lines(response)]
+
+    @pytest.mark.asyncio
+    async def test_lines_split_across_chunks(self) -> None:
+        """Test a line spanning several chunks is reassembled."""
+        lines = await self._collect(b"data: {\"a\"", b":1}\ndata: [DO", b"NE]\n")
+
+        assert lines == [b'data: {"a":1}', b"data: [DONE]"]
+
+    @pytest.mark.asyncio
+    async def test_multiple_lines_in_one_chunk(self) -> None:
+        """Test several lines in a single chunk, including empty ones."""
+        lines = await self._collect(b"data: 1\n\ndata: 2\n")
+
+        assert lines == [b"data: 1", b"", b"data: 2"]
+
+    @pytest.mark.asyncio
+    async def test_crlf_terminators_stripped(self) -> None:
+        """Test CRLF line endings are normalized."""
+        lines = await self._collect(b"data: 1\r\n\r\ndata: 2\r\n")
+
+        assert lines == [b"data: 1", b"", b"data: 2"]
+
+    @pytest.mark.asyncio
+    async def test_whole_stream_in_one_chunk(self) -> None:
+        """Test a full SSE body delivered as a single chunk."""
+        lines = await self._collect(b"data: 1\n\ndata: 2\n\ndata: [DONE]\n\n")
+
+        assert lines == [b"data: 1", b"", b"data: 2", b"", b"data: [DONE]", b""]
+
+    @pytest.mark.asyncio
+    async def test_reads_large_chunks(self) -> None:
+        """Test the response is read in 64 KiB chunks."""
+        response = _FakeStreamResponse(200, frames=(b"data: 1\n",))
+
+        _ = [line async for line in _aiter_sse_lines(response)]
+
+        assert response.chunk_size == 64 * 1024
+
+    @pytest.mark.asyncio
+    async def test_trailing_line_without_newline(self) -> None:
+        """Test a final unterminated line is still yielded."""
+        lines = await self._collect(b"data: 1\ndata: 2")
+
+        assert lines == [b"data: 1", b"data: 2"]
+
+
+class TestRequestBodies:
+    """Tests for pre-serialized provider request bodies."""
+
+    @pytest.fixture(scope="class")
+    def config(self) -> LLMConfig:
+        """Create a config shared by both providers."""
+        return LLMConfig(
+            provider="openai",
+            endpoint="https://example.com",
+            model_id="model-x",
+            api_key="test-key",
+            max_tokens=256,
+            temperature=0.2,
+        )
+
+    @pytest.fixture(scope="class")
+    def messages(self) -> list[ChatMessage]:
+        """Create sample messages with a system prompt."""
+        return [
+            ChatMessage(role="system", content="You are helpful."),
+            ChatMessage(role="user", content="Hello"),
+        ]
+
+    def test_openai_body(self, config: LLMConfig, messages: list[ChatMessage]) -> None:
+        """Test OpenAI body keeps all messages in order and enables streaming."""
+        body = _build_openai_body(config, messages)
+
+        assert isinstance(body, bytes)
+        assert json.loads(body) == {
+            "model": "model-x",
+            "messages": [
+                {"role": "system", "content": "You are helpful."},
+                {"role": "user", "content": "Hello"},
+            ],
+            "max_tokens": 256,
+            "temperature": 0.2,
+            "stream": True,
+        }
+
+    def test_anthropic_body_lifts_system_prompt(
+        self, config: LLMConfig, messages: list[ChatMessage]
+    ) -> None:
+        """Test Anthropic body moves the system message to the system field."""
+        payload = json.loads(_build_anthropic_body(config, messages))
+
+        assert payload["system"] == "You are helpful."
+        assert payload["messages"] == [{"role": "user", "content": "Hello"}]
+        assert payload["stream"] is True
+
+    def test_anthropic_body_without_system_prompt(self, config: LLMConfig) -> None:
+        """Test Anthropic body omits system when no system message is given."""
+        payload = json.loads(
+            _build_anthropic_body(config, [ChatMessage(role="user", content="Hi")])
+        )
+
+        assert "system" not in payload
+
+
 class TestLLMClientStreamCompletion:
     """Tests for LLMClient.stream_completion()."""
 
@@ -186,7 +318,7 @@ class TestLLMClientStreamCompletion:
         """Create LLMClient instance."""
         return LLMClient(timeout=30.0)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def openai_config(self) -> LLMConfig:
         """Create OpenAI-compatible config."""
         return LLMConfig(
@@ -198,7 +330,7 @@ class TestLLMClientStreamCompletion:
             temperature=0.7,
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def anthropic_config(self) -> LLMConfig:
         """Create Anthropic config."""
         return LLMConfig(
@@ -210,7 +342,7 @@ class TestLLMClientStreamCompletion:
             temperature=0.7,
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def messages(self) -> list[ChatMessage]:
         """Create sample messages."""
         return [
@@ -227,20 +359,16 @@ class TestLLMClientStreamCompletion:
     ) -> None:
         """Test streaming from OpenAI-compatible API."""
         # Mock httpx response with SSE stream
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-
-        async def mock_iter_lines():
-            yield 'data: {"choices":[{"delta":{"content":"Hello"}}]}'
-            yield 'data: {"choices":[{"delta":{"content":" world"}}]}'
-            yield "data: [DONE]"
-
-        mock_response.aiter_lines = mock_iter_lines
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(return_value=AsyncMock())
-        mock_client.stream.return_value.__aenter__.return_value = mock_response
+        mock_response = _FakeStreamResponse(
+            200,
+            frames=(
+                b'data: {"choices":[{"delta":{"content":"Hello"}}]}\n',
+                b'data: {"choices":[{"delta":{"content":" world"}}]}\n',
+                b"data: [DONE]\n",
+            ),
+        )
 
+        mock_client = _FakeHttpClient(mock_response)
         client._client = mock_client
 
         tokens = []
@@ -257,20 +385,16 @@ class TestLLMClientStreamCompletion:
         messages: list[ChatMessage],
     ) -> None:
         """Test streaming from Anthropic API."""
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-
-        async def mock_iter_lines():
-            yield 'data: {"type":"content_block_delta","delta":{"text":"Hi"}}'
-            yield 'data: {"type":"content_block_delta","delta":{"text":" there"}}'
-            yield 'data: {"type":"message_stop"}'
-
-        mock_response.aiter_lines = mock_iter_lines
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(return_value=AsyncMock())
-        mock_client.stream.return_value.__aenter__.return_value = mock_response
+        mock_response = _FakeStreamResponse(
+            200,
+            frames=(
+                b'data: {"type":"content_block_delta","delta":{"text":"Hi"}}\n',
+                b'data: {"type":"content_block_delta","delta":{"text":" there"}}\n',
+                b'data: {"type":"message_stop"}\n',
+            ),
+        )
 
+        mock_client = _FakeHttpClient(mock_response)
         client._client = mock_client
 
         tokens = []
@@ -295,18 +419,14 @@ class TestLLMClientStreamCompletion:
             temperature=0.3,  # Specific value to verify
         )
 
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-
-        async def mock_iter_lines():
-            yield 'data: {"type":"message_stop"}'
-
-        mock_response.aiter_lines = mock_iter_lines
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(return_value=AsyncMock())
-        mock_client.stream.return_value.__aenter__.return_value = mock_response
+        mock_response = _FakeStreamResponse(
+            200,
+            frames=(
+                b'data: {"type":"message_stop"}\n',
+            ),
+        )
 
+        mock_client = _FakeHttpClient(mock_response)
         client._client = mock_client
 
         tokens = []
@@ -314,8 +434,8 @@ class TestLLMClientStreamCompletion:
             tokens.append(token)
 
         # Verify temperature was passed in the request payload
-        call_args = mock_client.stream.call_args
-        json_payload = call_args.kwargs.get("json", {})
+        _, _, request_kwargs = mock_client.calls[-1]
+        json_payload = json.loads(request_kwargs["content"])
         assert json_payload.get("temperature") == 0.3
 
     @pytest.mark.asyncio
@@ -349,18 +469,9 @@ class TestLLMClientStreamCompletion:
         messages: list[ChatMessage],
     ) -> None:
         """Test API error response raises ServiceUnavailableError."""
-        mock_response = AsyncMock()
-        mock_response.status_code = 500
-
-        async def mock_aread():
-            return b'{"error": "Internal server error"}'
-
-        mock_response.aread = mock_aread
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(return_value=AsyncMock())
-        mock_client.stream.return_value.__aenter__.return_value = mock_response
+        mock_response = _FakeStreamResponse(500, body=b'{"error": "Internal server error"}')
 
+        mock_client = _FakeHttpClient(mock_response)
         client._client = mock_client
 
         with pytest.raises(ServiceUnavailableError):
@@ -412,7 +523,7 @@ class TestLLMClientAnthropicToken:
             session_key="test-session-key",
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def messages(self) -> list[ChatMessage]:
         """Create sample messages."""
         return [
@@ -429,26 +540,20 @@ class TestLLMClientAnthropicToken:
     ) -> None:
         """Test stream_completion routes to anthropic-token provider."""
         mock_response = ClaudeCliResponse(text="Hello from Claude CLI!")
+        mock_provider = MagicMock(spec=ClaudeCliProvider)
+        mock_provider.complete = AsyncMock(return_value=mock_response)
+        client._claude_cli = mock_provider
 
-        with patch.object(
-            ClaudeCliProvider,
-            "complete",
-            new_callable=AsyncMock,
-            return_value=mock_response,
+        tokens = []
+        async for token in client.stream_completion(
+            anthropic_token_config,
+            messages,
         ):
-            with patch.object(
-                ClaudeCliProvider,
-                "ensure_credentials_file",
-            ):
-                tokens = []
-                async for token in client.stream_completion(
-                    anthropic_token_config,
-                    messages,
-                ):
-                    tokens.append(token)
-
-                # Non-streaming: single yield with full response
-                assert tokens == ["Hello from Claude CLI!"]
+            tokens.append(token)
+
+        # Non-streaming: single yield with full response
+        assert tokens == ["Hello from Claude CLI!"]
+        mock_provider.complete.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_complete_anthropic_token_success(
@@ -684,7 +789,7 @@ class TestLLMClientAnthropicTokenEdgeCases:
         """Create LLMClient instance."""
         return LLMClient(timeout=30.0)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def config(self) -> LLMConfig:
         """Create anthropic-token config."""
         return LLMConfig(
@@ -768,7 +873,7 @@ class TestStreamCompletionRouting:
         """Create LLMClient instance."""
         return LLMClient(timeout=30.0)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def messages(self) -> list[ChatMessage]:
         """Create sample messages."""
         return [ChatMessage(role="user", content="Hello")]
@@ -789,19 +894,15 @@ class TestStreamCompletionRouting:
             temperature=0.7,
         )
 
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-
-        async def mock_iter_lines():
-            yield 'data: {"choices":[{"delta":{"content":"Hi"}}]}'
-            yield "data: [DONE]"
-
-        mock_response.aiter_lines = mock_iter_lines
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(return_value=AsyncMock())
-        mock_client.stream.return_value.__aenter__.return_value = mock_response
+        mock_response = _FakeStreamResponse(
+            200,
+            frames=(
+                b'data: {"choices":[{"delta":{"content":"Hi"}}]}\n',
+                b"data: [DONE]\n",
+            ),
+        )
 
+        mock_client = _FakeHttpClient(mock_response)
         client._client = mock_client
 
         tokens = []
@@ -826,19 +927,15 @@ class TestStreamCompletionRouting:
             temperature=0.7,
         )
 
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-
-        async def mock_iter_lines():
-            yield 'data: {"type":"content_block_delta","delta":{"text":"Hello"}}'
-            yield 'data: {"type":"message_stop"}'
-
-        mock_response.aiter_lines = mock_iter_lines
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(return_value=AsyncMock())
-        mock_client.stream.return_value.__aenter__.return_value = mock_response
+        mock_response = _FakeStreamResponse(
+            200,
+            frames=(
+                b'data: {"type":"content_block_delta","delta":{"text":"Hello"}}\n',
+                b'data: {"type":"message_stop"}\n',
+            ),
+        )
 
+        mock_client = _FakeHttpClient(mock_response)
         client._client = mock_client
 
         tokens = []
@@ -868,6 +965,25 @@ class TestEnsureClient:
         # Cleanup
         await client.close()
 
+    @pytest.mark.asyncio
+    async def test_ensure_client_configures_pooling_and_http2(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test _ensure_client passes shared limits, HTTP/2 and a short connect timeout."""
+        mock_cls = MagicMock()
+        monkeypatch.setattr("api.logic.llm_client.httpx.AsyncClient", mock_cls)
+        client = LLMClient(timeout=60.0)
+
+        http_client = await client._ensure_client()
+
+        assert http_client is mock_cls.return_value
+        mock_cls.assert_called_once()
+        kwargs = mock_cls.call_args.kwargs
+        assert kwargs["limits"] is _HTTP_LIMITS
+        assert kwargs["http2"] is True
+        assert kwargs["timeout"].connect == 5.0
+        assert kwargs["timeout"].read == 60.0
+
 
 class TestStreamingEdgeCases:
     """Tests for streaming edge cases and error handling."""
@@ -877,7 +993,7 @@ class TestStreamingEdgeCases:
         """Create LLMClient instance."""
         return LLMClient(timeout=30.0)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def openai_config(self) -> LLMConfig:
         """Create OpenAI-compatible config."""
         return LLMConfig(
@@ -889,7 +1005,7 @@ class TestStreamingEdgeCases:
             temperature=0.7,
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def anthropic_config(self) -> LLMConfig:
         """Create Anthropic config."""
         return LLMConfig(
@@ -901,174 +1017,148 @@ class TestStreamingEdgeCases:
             temperature=0.7,
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def messages(self) -> list[ChatMessage]:
         """Create sample messages."""
         return [ChatMessage(role="user", content="Hello")]
 
-    @pytest.mark.asyncio
-    async def test_openai_json_decode_error_continues(
-        self,
-        client: LLMClient,
-        openai_config: LLMConfig,
-        messages: list[ChatMessage],
-    ) -> None:
-        """Test OpenAI stream handles JSON decode errors gracefully."""
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-
-        async def mock_iter_lines():
-            yield "data: {invalid json"  # Should be skipped
-            yield 'data: {"choices":[{"delta":{"content":"OK"}}]}'
-            yield "data: [DONE]"
-
-        mock_response.aiter_lines = mock_iter_lines
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(return_value=AsyncMock())
-        mock_client.stream.return_value.__aenter__.return_value = mock_response
-
-        client._client = mock_client
-
-        tokens = []
-        async for token in client._stream_openai_compatible(openai_config, messages):
-            tokens.append(token)
-
-        # Invalid JSON skipped, valid one processed
-        assert tokens == ["OK"]
-
-    @pytest.mark.asyncio
-    async def test_openai_http_error_raises_service_unavailable(
+    @pytest.fixture
+    def configs(
         self,
-        client: LLMClient,
         openai_config: LLMConfig,
-        messages: list[ChatMessage],
-    ) -> None:
-        """Test OpenAI HTTP error raises ServiceUnavailableError."""
-        import httpx
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(side_effect=httpx.HTTPError("Connection failed"))
-
-        client._client = mock_client
-
-        with pytest.raises(ServiceUnavailableError):
-            tokens = []
-            async for token in client._stream_openai_compatible(openai_config, messages):
-                tokens.append(token)
-
-    @pytest.mark.asyncio
-    async def test_anthropic_api_error_raises_service_unavailable(
-        self,
-        client: LLMClient,
         anthropic_config: LLMConfig,
-        messages: list[ChatMessage],
-    ) -> None:
-        """Test Anthropic API error (non-200) raises ServiceUnavailableError."""
-        mock_response = AsyncMock()
-        mock_response.status_code = 429  # Rate limited
-
-        async def mock_aread():
-            return b'{"error": "rate_limited"}'
-
-        mock_response.aread = mock_aread
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(return_value=AsyncMock())
-        mock_client.stream.return_value.__aenter__.return_value = mock_response
-
-        client._client = mock_client
-
-        with pytest.raises(ServiceUnavailableError) as exc_info:
-            tokens = []
-            async for token in client._stream_anthropic(anthropic_config, messages):
-                tokens.append(token)
-
-        assert "anthropic" in str(exc_info.value)
+    ) -> dict[str, LLMConfig]:
+        """Map provider family to its config fixture."""
+        return {"openai": openai_config, "anthropic": anthropic_config}
+
+    @staticmethod
+    def _stream(
+        client: LLMClient, provider: str, config: LLMConfig, messages: list[ChatMessage]
+    ) -> AsyncIterator[str]:
+        """Dispatch to the provider-specific streaming method."""
+        if provider == "anthropic":
+            return client._stream_anthropic(config, messages)
+        return client._stream_openai_compatible(config, messages)
 
     @pytest.mark.asyncio
-    async def test_anthropic_empty_line_skipped(
-        self,
-        client: LLMClient,
-        anthropic_config: LLMConfig,
-        messages: list[ChatMessage],
-    ) -> None:
-        """Test Anthropic stream handles empty lines correctly."""
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-
-        async def mock_iter_lines():
-            yield ""  # Empty line should be skipped
-            yield ""  # Another empty line
-            yield 'data: {"type":"content_block_delta","delta":{"text":"Hi"}}'
-            yield ""  # Empty after data
-            yield 'data: {"type":"message_stop"}'
-
-        mock_response.aiter_lines = mock_iter_lines
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(return_value=AsyncMock())
-        mock_client.stream.return_value.__aenter__.return_value = mock_response
-
-        client._client = mock_client
-
-        tokens = []
-        async for token in client._stream_anthropic(anthropic_config, messages):
-            tokens.append(token)
-
-        assert tokens == ["Hi"]
-
-    @pytest.mark.asyncio
-    async def test_anthropic_json_decode_error_continues(
+    @pytest.mark.parametrize(
+        ("provider", "frames", "expected"),
+        [
+            pytest.param(
+                "openai",
+                (
+                    b"data: {invalid json\n",  # Should be skipped
+                    b'data: {"choices":[{"delta":{"content":"OK"}}]}\n',
+                    b"data: [DONE]\n",
+                ),
+                ["OK"],
+                id="openai-json-decode-error-continues",
+            ),
+            pytest.param(
+                "anthropic",
+                (
+                    b"\n",  # Empty line should be skipped
+                    b"\n",  # Another empty line
+                    b'data: {"type":"content_block_delta","delta":{"text":"Hi"}}\n',
+                    b"\n",  # Empty after data
+                    b'data: {"type":"message_stop"}\n',
+                ),
+                ["Hi"],
+                id="anthropic-empty-line-skipped",
+            ),
+            pytest.param(
+                "anthropic",
+                (
+                    b"data: {invalid\n",  # Bad JSON, should skip
+                    b'data: {"type":"content_block_delta","delta":{"text":"OK"}}\n',
+                    b'data: {"type":"message_stop"}\n',
+                ),
+                ["OK"],
+                id="anthropic-json-decode-error-continues",
+            ),
+            pytest.param(
+                "openai",
+                (
+                    b": keep-alive comment\n",
+                    b"event: message\n",
+                    b'data:{"choices":[{"delta":{"content":"No"}}]}\n',
+                    b'data: {"choices":[{"delta":{"content":" space"}}]}\n',
+                    b"data:[DONE]\n",
+                ),
+                ["No", " space"],
+                id="openai-data-without-space",
+            ),
+            pytest.param(
+                "anthropic",
+                (
+                    b"event: content_block_delta\n",
+                    b'data:{"type":"content_block_delta","delta":{"text":"Hi"}}\n',
+                ),
+                ["Hi"],
+                id="anthropic-data-without-space",
+            ),
+        ],
+    )
+    async def test_stream_skips_malformed_frames(
         self,
         client: LLMClient,
-        anthropic_config: LLMConfig,
+        configs: dict[str, LLMConfig],
         messages: list[ChatMessage],
+        provider: str,
+        frames: tuple[bytes, ...],
+        expected: list[str],
     ) -> None:
-        """Test Anthropic stream handles JSON decode errors gracefully."""
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-
-        async def mock_iter_lines():
-            yield "data: {invalid"  # Bad JSON, should skip
-            yield 'data: {"type":"content_block_delta","delta":{"text":"OK"}}'
-            yield 'data: {"type":"message_stop"}'
-
-        mock_response.aiter_lines = mock_iter_lines
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(return_value=AsyncMock())
-        mock_client.stream.return_value.__aenter__.return_value = mock_response
+        """Test streams skip non-data lines and invalid JSON and keep going."""
+        client._client = _FakeHttpClient(_FakeStreamResponse(200, frames=frames))
 
-        client._client = mock_client
-
-        tokens = []
-        async for token in client._stream_anthropic(anthropic_config, messages):
-            tokens.append(token)
+        tokens = [
+            token async for token in self._stream(client, provider, configs[provider], messages)
+        ]
 
-        assert tokens == ["OK"]
+        assert tokens == expected
 
     @pytest.mark.asyncio
-    async def test_anthropic_http_error_raises_service_unavailable(
+    @pytest.mark.parametrize(
+        ("provider", "http_client", "expected_message"),
+        [
+            pytest.param(
+                "openai",
+                MagicMock(stream=MagicMock(side_effect=httpx.HTTPError("Connection failed"))),
+                None,
+                id="openai-http-error",
+            ),
+            pytest.param(
+                "anthropic",
+                MagicMock(stream=MagicMock(side_effect=httpx.HTTPError("Connection failed"))),
+                "anthropic",
+                id="anthropic-http-error",
+            ),
+            pytest.param(
+                "anthropic",
+                _FakeHttpClient(_FakeStreamResponse(429, body=b'{"error": "rate_limited"}')),
+                "anthropic",
+                id="anthropic-api-error",
+            ),
+        ],
+    )
+    async def test_stream_errors_raise_service_unavailable(
         self,
         client: LLMClient,
-        anthropic_config: LLMConfig,
+        configs: dict[str, LLMConfig],
         messages: list[ChatMessage],
+        provider: str,
+        http_client: object,
+        expected_message: str | None,
     ) -> None:
-        """Test Anthropic HTTP error raises ServiceUnavailableError."""
-        import httpx
-
-        mock_client = AsyncMock()
-        mock_client.stream = MagicMock(side_effect=httpx.HTTPError("Connection failed"))
-
-        client._client = mock_client
+        """Test transport failures and non-200 responses raise ServiceUnavailableError."""
+        client._client = http_client
 
         with pytest.raises(ServiceUnavailableError) as exc_info:
-            tokens = []
-            async for token in client._stream_anthropic(anthropic_config, messages):
-                tokens.append(token)
+            async for _ in self._stream(client, provider, configs[provider], messages):
+                pass
 
-        assert "anthropic" in str(exc_info.value)
+        if expected_message is not None:
+            assert expected_message in str(exc_info.value)
 
 
 class TestGlobalFunctions:
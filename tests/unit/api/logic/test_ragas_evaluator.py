@@ -7,19 +7,42 @@ partial failure tolerance, and score pushing.
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import itertools
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
 from api.logic.ragas_evaluator import (
     EvalResult,
+    _build_ragas_embeddings,
+    _build_ragas_llm,
+    _get_ragas_embeddings,
+    _get_ragas_llm,
     _get_sample_rate,
-    _push_score,
+    _load_ragas,
+    _push_scores,
+    _reset_sample_rate_cache,
+    _run_evaluation,
     _should_evaluate,
     maybe_evaluate_async,
 )
 
 
+def _pushed_scores(mock_score: MagicMock) -> dict[str, float]:
+    """Collect the metric name and value from each patched score_trace() call."""
+    return {c.args[1]: c.args[2] for c in mock_score.call_args_list}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_sample_rate():
+    """Re-read API_RAGAS_SAMPLE_RATE in every test that patches the environment."""
+    _reset_sample_rate_cache()
+    yield
+    _reset_sample_rate_cache()
+
+
 class TestEvalResult:
     """Tests for EvalResult dataclass."""
 
@@ -89,6 +112,16 @@ class TestGetSampleRate:
             rate = _get_sample_rate()
             assert rate == 0.0
 
+    def test_rate_is_cached_until_reset(self) -> None:
+        """Env var is parsed once; later changes apply only after a reset."""
+        with patch.dict("os.environ", {"API_RAGAS_SAMPLE_RATE": "0.5"}):
+            assert _get_sample_rate() == 0.5
+
+        with patch.dict("os.environ", {"API_RAGAS_SAMPLE_RATE": "0.9"}):
+            assert _get_sample_rate() == 0.5
+            _reset_sample_rate_cache()
+            assert _get_sample_rate() == 0.9
+
 
 class TestShouldEvaluate:
     """Tests for _should_evaluate()."""
@@ -103,22 +136,70 @@ class TestShouldEvaluate:
         with patch.dict("os.environ", {"API_RAGAS_SAMPLE_RATE": "0.0"}):
             assert _should_evaluate() is False
 
-    def test_respects_random_threshold(self) -> None:
-        """Returns True when random value is below sample rate."""
+    def test_selects_request_when_sampled_total_increases(self) -> None:
+        """Returns True when floor((n + 1) * rate) steps past floor(n * rate)."""
         with (
             patch.dict("os.environ", {"API_RAGAS_SAMPLE_RATE": "0.5"}),
-            patch("api.logic.ragas_evaluator.random.random", return_value=0.3),
+            patch("api.logic.ragas_evaluator._sample_counter", itertools.count(3)),
         ):
             assert _should_evaluate() is True
 
-    def test_rejects_above_threshold(self) -> None:
-        """Returns False when random value is above sample rate."""
+    def test_skips_request_between_samples(self) -> None:
+        """Returns False when the sampled total does not increase."""
         with (
             patch.dict("os.environ", {"API_RAGAS_SAMPLE_RATE": "0.5"}),
-            patch("api.logic.ragas_evaluator.random.random", return_value=0.7),
+            patch("api.logic.ragas_evaluator._sample_counter", itertools.count(2)),
         ):
             assert _should_evaluate() is False
 
+    def test_samples_every_nth_request(self) -> None:
+        """A rate of 0.1 evaluates exactly one request in ten."""
+        with (
+            patch.dict("os.environ", {"API_RAGAS_SAMPLE_RATE": "0.1"}),
+            patch("api.logic.ragas_evaluator._sample_counter", itertools.count()),
+        ):
+            decisions = [_should_evaluate() for _ in range(100)]
+
+        assert decisions.count(True) == 10
+        assert decisions[9] is True
+        assert decisions[19] is True
+
+    @pytest.mark.parametrize(
+        ("rate", "calls", "expected"),
+        [
+            ("0.4", 10, 4),
+            ("0.7", 10, 7),
+            ("0.3", 100, 30),
+            ("0.4", 100, 40),
+            ("0.7", 100, 70),
+            ("0.9", 100, 90),
+        ],
+    )
+    def test_honours_rates_that_are_not_reciprocals(
+        self, rate: str, calls: int, expected: int
+    ) -> None:
+        """Rates other than 1/n evaluate exactly rate * calls requests."""
+        with (
+            patch.dict("os.environ", {"API_RAGAS_SAMPLE_RATE": rate}),
+            patch("api.logic.ragas_evaluator._sample_counter", itertools.count()),
+        ):
+            decisions = [_should_evaluate() for _ in range(calls)]
+
+        assert decisions.count(True) == expected
+
+    def test_uses_cached_rate_until_reset(self) -> None:
+        """Sampling follows the cached rate until the cache is dropped."""
+        with (
+            patch.dict("os.environ", {"API_RAGAS_SAMPLE_RATE": "0.0"}),
+            patch("api.logic.ragas_evaluator._sample_counter", itertools.count()),
+        ):
+            assert _should_evaluate() is False
+
+        with patch.dict("os.environ", {"API_RAGAS_SAMPLE_RATE": "1.0"}):
+            assert _should_evaluate() is False
+            _reset_sample_rate_cache()
+            assert _should_evaluate() is True
+
 
 class TestMaybeEvaluateAsync:
     """Tests for maybe_evaluate_async()."""
@@ -279,11 +360,39 @@ class TestMaybeEvaluateAsync:
             assert result is None
 
 
+@pytest.fixture
+def ragas_classes(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Stand-in RAGAS classes served by _load_ragas(), without touching sys.modules."""
+    classes = SimpleNamespace(
+        SingleTurnSample=MagicMock(),
+        Faithfulness=MagicMock(),
+        LLMContextPrecisionWithoutReference=MagicMock(),
+        ResponseRelevancy=MagicMock(),
+    )
+    monkeypatch.setattr(
+        "api.logic.ragas_evaluator._load_ragas",
+        lambda: (
+            classes.SingleTurnSample,
+            classes.Faithfulness,
+            classes.LLMContextPrecisionWithoutReference,
+            classes.ResponseRelevancy,
+        ),
+    )
+    return classes
+
+
 class TestRunEvaluation:
     """Tests for _run_evaluation() with mocked RAGAS metrics."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_ragas_cache(self):
+        """Re-import ragas in the tests that exercise _load_ragas() itself."""
+        _load_ragas.cache_clear()
+        yield
+        _load_ragas.cache_clear()
+
     @pytest.mark.asyncio
-    async def test_runs_all_metrics(self) -> None:
+    async def test_runs_all_metrics(self, ragas_classes: SimpleNamespace) -> None:
         """Runs faithfulness, context_precision, and response_relevancy metrics."""
         mock_faithfulness = AsyncMock()
         mock_faithfulness.single_turn_ascore.return_value = 0.9
@@ -294,52 +403,36 @@ class TestRunEvaluation:
         mock_relevancy = AsyncMock()
         mock_relevancy.single_turn_ascore.return_value = 0.85
 
+        ragas_classes.Faithfulness.return_value = mock_faithfulness
+        ragas_classes.LLMContextPrecisionWithoutReference.return_value = mock_precision
+        ragas_classes.ResponseRelevancy.return_value = mock_relevancy
+
         with (
-            patch(
-                "api.logic.ragas_evaluator.is_langfuse_enabled",
-                return_value=True,
-            ),
-            patch(
-                "api.logic.ragas_evaluator._should_evaluate",
-                return_value=True,
-            ),
-            patch("api.logic.ragas_evaluator._get_ragas_llm") as mock_llm,
-            patch("api.logic.ragas_evaluator._get_ragas_embeddings") as mock_emb,
+            patch("api.logic.ragas_evaluator._get_ragas_llm", return_value=MagicMock()),
+            patch("api.logic.ragas_evaluator._get_ragas_embeddings", return_value=MagicMock()),
             patch("api.logic.ragas_evaluator.score_trace") as mock_score,
         ):
-            mock_llm.return_value = MagicMock()
-            mock_emb.return_value = MagicMock()
-
-            # Patch the metric classes to return our mocks
-            with patch.dict("sys.modules", {
-                "ragas": MagicMock(),
-                "ragas.dataset_schema": MagicMock(),
-                "ragas.metrics": MagicMock(
-                    Faithfulness=MagicMock(return_value=mock_faithfulness),
-                    LLMContextPrecisionWithoutReference=MagicMock(return_value=mock_precision),
-                    ResponseRelevancy=MagicMock(return_value=mock_relevancy),
-                ),
-            }):
-                # Import fresh to pick up mocked modules
-                from api.logic.ragas_evaluator import _run_evaluation
-
-                result = await _run_evaluation(
-                    trace_id="trace_1",
-                    query="What is AI?",
-                    response="AI is artificial intelligence.",
-                    contexts=["AI stands for artificial intelligence."],
-                )
+            result = await _run_evaluation(
+                trace_id="trace_1",
+                query="What is AI?",
+                response="AI is artificial intelligence.",
+                contexts=["AI stands for artificial intelligence."],
+            )
 
-                assert result.trace_id == "trace_1"
-                assert result.faithfulness == 0.9
-                assert result.context_precision == 0.8
-                assert result.response_relevancy == 0.85
+        assert result.trace_id == "trace_1"
+        assert result.faithfulness == 0.9
+        assert result.context_precision == 0.8
+        assert result.response_relevancy == 0.85
 
-                # Should push 3 scores
-                assert mock_score.call_count == 3
+        # All 3 scores pushed
+        assert _pushed_scores(mock_score) == {
+            "faithfulness": 0.9,
+            "context_precision": 0.8,
+            "response_relevancy": 0.85,
+        }
 
     @pytest.mark.asyncio
-    async def test_partial_failure_tolerance(self) -> None:
+    async def test_partial_failure_tolerance(self, ragas_classes: SimpleNamespace) -> None:
         """Continues evaluating remaining metrics when one fails."""
         mock_faithfulness = AsyncMock()
         mock_faithfulness.single_turn_ascore.side_effect = RuntimeError("LLM timeout")
@@ -347,88 +440,111 @@ class TestRunEvaluation:
         mock_precision = AsyncMock()
         mock_precision.single_turn_ascore.return_value = 0.75
 
+        ragas_classes.Faithfulness.return_value = mock_faithfulness
+        ragas_classes.LLMContextPrecisionWithoutReference.return_value = mock_precision
+
         with (
-            patch(
-                "api.logic.ragas_evaluator.is_langfuse_enabled",
-                return_value=True,
-            ),
-            patch(
-                "api.logic.ragas_evaluator._should_evaluate",
-                return_value=True,
-            ),
-            patch("api.logic.ragas_evaluator._get_ragas_llm") as mock_llm,
-            patch("api.logic.ragas_evaluator._get_ragas_embeddings") as mock_emb,
+            patch("api.logic.ragas_evaluator._get_ragas_llm", return_value=MagicMock()),
+            # No embeddings → no response_relevancy
+            patch("api.logic.ragas_evaluator._get_ragas_embeddings", return_value=None),
             patch("api.logic.ragas_evaluator.score_trace") as mock_score,
         ):
-            mock_llm.return_value = MagicMock()
-            mock_emb.return_value = None  # No embeddings → no response_relevancy
-
-            with patch.dict("sys.modules", {
-                "ragas": MagicMock(),
-                "ragas.dataset_schema": MagicMock(),
-                "ragas.metrics": MagicMock(
-                    Faithfulness=MagicMock(return_value=mock_faithfulness),
-                    LLMContextPrecisionWithoutReference=MagicMock(return_value=mock_precision),
-                    ResponseRelevancy=MagicMock(),
-                ),
-            }):
-                from api.logic.ragas_evaluator import _run_evaluation
-
-                result = await _run_evaluation(
-                    trace_id="trace_1",
-                    query="test",
-                    response="response",
-                    contexts=["context"],
-                )
+            result = await _run_evaluation(
+                trace_id="trace_1",
+                query="test",
+                response="response",
+                contexts=["context"],
+            )
 
-                # Faithfulness failed, but context_precision succeeded
-                assert result.faithfulness is None
-                assert result.context_precision == 0.75
-                assert result.response_relevancy is None
+        # Faithfulness failed, but context_precision succeeded
+        assert result.faithfulness is None
+        assert result.context_precision == 0.75
+        assert result.response_relevancy is None
 
-                # Only 1 score pushed (context_precision)
-                assert mock_score.call_count == 1
+        # Only context_precision pushed
+        assert _pushed_scores(mock_score) == {"context_precision": 0.75}
 
     @pytest.mark.asyncio
     async def test_handles_ragas_import_error(self) -> None:
         """Returns empty EvalResult when ragas package not installed."""
+        # Force ImportError on ragas imports
+        import builtins
+
+        original_import = builtins.__import__
+
+        def mock_import(name: str, *args, **kwargs):
+            if name.startswith("ragas"):
+                raise ImportError("No module named 'ragas'")
+            return original_import(name, *args, **kwargs)
+
+        with patch("builtins.__import__", side_effect=mock_import):
+            result = await _run_evaluation(
+                trace_id="trace_1",
+                query="test",
+                response="response",
+                contexts=[],
+            )
+
+        assert result.trace_id == "trace_1"
+        assert result.faithfulness is None
+        assert result.response_relevancy is None
+        assert result.context_precision is None
+
+    @pytest.mark.asyncio
+    async def test_metrics_run_concurrently(self, ragas_classes: SimpleNamespace) -> None:
+        """Metrics are awaited together, not one after another."""
+        precision_started = asyncio.Event()
+
+        async def faithfulness_score(sample):
+            # Only completes if context_precision is already in flight
+            await asyncio.wait_for(precision_started.wait(), timeout=1.0)
+            return 0.9
+
+        async def precision_score(sample):
+            precision_started.set()
+            return 0.8
+
+        ragas_classes.Faithfulness.return_value.single_turn_ascore = faithfulness_score
+        ragas_classes.LLMContextPrecisionWithoutReference.return_value.single_turn_ascore = (
+            precision_score
+        )
+
         with (
-            patch(
-                "api.logic.ragas_evaluator.is_langfuse_enabled",
-                return_value=True,
-            ),
-            patch(
-                "api.logic.ragas_evaluator._should_evaluate",
-                return_value=True,
-            ),
+            patch("api.logic.ragas_evaluator._get_ragas_llm", return_value=MagicMock()),
+            patch("api.logic.ragas_evaluator._get_ragas_embeddings", return_value=None),
+            patch("api.logic.ragas_evaluator.score_trace"),
         ):
-            # Force ImportError on ragas imports
-            import builtins
-
-            original_import = builtins.__import__
+            result = await _run_evaluation(
+                trace_id="trace_1",
+                query="test",
+                response="response",
+                contexts=["ctx"],
+            )
 
-            def mock_import(name: str, *args, **kwargs):
-                if name.startswith("ragas"):
-                    raise ImportError("No module named 'ragas'")
-                return original_import(name, *args, **kwargs)
+        assert result.faithfulness == 0.9
+        assert result.context_precision == 0.8
 
-            with patch("builtins.__import__", side_effect=mock_import):
-                from api.logic.ragas_evaluator import _run_evaluation
+    def test_ragas_classes_loaded_once(self) -> None:
+        """Repeated loads return the cached classes without re-importing."""
+        fake_metrics = MagicMock()
+        with patch.dict("sys.modules", {
+            "ragas": MagicMock(),
+            "ragas.dataset_schema": MagicMock(),
+            "ragas.metrics": fake_metrics,
+        }):
+            first = _load_ragas()
 
-                result = await _run_evaluation(
-                    trace_id="trace_1",
-                    query="test",
-                    response="response",
-                    contexts=[],
-                )
+        # ragas is no longer importable, but the cached classes are reused
+        second = _load_ragas()
 
-                assert result.trace_id == "trace_1"
-                assert result.faithfulness is None
-                assert result.response_relevancy is None
-                assert result.context_precision is None
+        assert first is not None
+        assert second is first
+        assert first[1] is fake_metrics.Faithfulness
 
     @pytest.mark.asyncio
-    async def test_skips_response_relevancy_without_embeddings(self) -> None:
+    async def test_skips_response_relevancy_without_embeddings(
+        self, ragas_classes: SimpleNamespace
+    ) -> None:
         """Skips response_relevancy when embeddings wrapper is None."""
         mock_faithfulness = AsyncMock()
         mock_faithfulness.single_turn_ascore.return_value = 0.9
@@ -436,66 +552,117 @@ class TestRunEvaluation:
         mock_precision = AsyncMock()
         mock_precision.single_turn_ascore.return_value = 0.8
 
+        ragas_classes.Faithfulness.return_value = mock_faithfulness
+        ragas_classes.LLMContextPrecisionWithoutReference.return_value = mock_precision
+
         with (
-            patch(
-                "api.logic.ragas_evaluator.is_langfuse_enabled",
-                return_value=True,
-            ),
-            patch(
-                "api.logic.ragas_evaluator._should_evaluate",
-                return_value=True,
-            ),
-            patch("api.logic.ragas_evaluator._get_ragas_llm") as mock_llm,
-            patch("api.logic.ragas_evaluator._get_ragas_embeddings") as mock_emb,
+            patch("api.logic.ragas_evaluator._get_ragas_llm", return_value=MagicMock()),
+            # No embeddings
+            patch("api.logic.ragas_evaluator._get_ragas_embeddings", return_value=None),
             patch("api.logic.ragas_evaluator.score_trace") as mock_score,
         ):
-            mock_llm.return_value = MagicMock()
-            mock_emb.return_value = None  # No embeddings
-
-            with patch.dict("sys.modules", {
-                "ragas": MagicMock(),
-                "ragas.dataset_schema": MagicMock(),
-                "ragas.metrics": MagicMock(
-                    Faithfulness=MagicMock(return_value=mock_faithfulness),
-                    LLMContextPrecisionWithoutReference=MagicMock(return_value=mock_precision),
-                    ResponseRelevancy=MagicMock(),
-                ),
-            }):
-                from api.logic.ragas_evaluator import _run_evaluation
+            result = await _run_evaluation(
+                trace_id="trace_1",
+                query="test",
+                response="response",
+                contexts=["ctx"],
+            )
 
-                result = await _run_evaluation(
-                    trace_id="trace_1",
-                    query="test",
-                    response="response",
-                    contexts=["ctx"],
-                )
+        assert result.faithfulness == 0.9
+        assert result.context_precision == 0.8
+        assert result.response_relevancy is None
+        ragas_classes.ResponseRelevancy.assert_not_called()
+        # Only 2 scores pushed (no response_relevancy)
+        assert _pushed_scores(mock_score) == {
+            "faithfulness": 0.9,
+            "context_precision": 0.8,
+        }
 
-                assert result.faithfulness == 0.9
-                assert result.context_precision == 0.8
-                assert result.response_relevancy is None
-                # Only 2 scores pushed (no response_relevancy)
-                assert mock_score.call_count == 2
 
+class TestPushScores:
+    """Tests for _push_scores()."""
 
-class TestPushScore:
-    """Tests for _push_score()."""
+    def test_calls_score_trace_per_metric(self) -> None:
+        """Delegates each metric to langfuse_helper.score_trace()."""
+        with patch("api.logic.ragas_evaluator.score_trace") as mock_score:
+            _push_scores("trace_1", {"faithfulness": 0.95, "context_precision": 0.8})
+
+            assert mock_score.call_args_list == [
+                call("trace_1", "faithfulness", 0.95, comment="RAGAS faithfulness (automated)"),
+                call(
+                    "trace_1",
+                    "context_precision",
+                    0.8,
+                    comment="RAGAS context_precision (automated)",
+                ),
+            ]
 
-    def test_calls_score_trace(self) -> None:
-        """Delegates to langfuse_helper.score_trace()."""
+    def test_skips_empty_scores(self) -> None:
+        """Nothing is pushed when every metric failed."""
         with patch("api.logic.ragas_evaluator.score_trace") as mock_score:
-            _push_score("trace_1", "faithfulness", 0.95)
+            _push_scores("trace_1", {})
+
+            mock_score.assert_not_called()
+
+
+class TestRagasJudgeCache:
+    """Tests for judge LLM/embeddings wrapper reuse across traces."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_judge_cache(self):
+        """Start and finish each test with empty wrapper caches."""
+        _build_ragas_llm.cache_clear()
+        _build_ragas_embeddings.cache_clear()
+        yield
+        _build_ragas_llm.cache_clear()
+        _build_ragas_embeddings.cache_clear()
+
+    @pytest.fixture
+    def fake_modules(self):
+        """Stub langchain_openai and ragas wrapper modules."""
+        langchain_openai = MagicMock()
+        with patch.dict("sys.modules", {
+            "langchain_openai": langchain_openai,
+            "ragas": MagicMock(),
+            "ragas.llms": MagicMock(),
+            "ragas.embeddings": MagicMock(),
+        }):
+            yield langchain_openai
+
+    def test_llm_wrapper_reused_for_same_config(self, fake_modules: MagicMock) -> None:
+        """Same judge config returns the same wrapper without rebuilding the client."""
+        config = {"endpoint": "http://llm", "model_id": "gpt-4", "api_key": "k"}
 
-            mock_score.assert_called_once_with(
-                trace_id="trace_1",
-                name="faithfulness",
-                value=0.95,
-                comment="RAGAS faithfulness (automated)",
-            )
+        with patch.dict("os.environ", {}, clear=True):
+            first = _get_ragas_llm(config)
+            second = _get_ragas_llm(dict(config))
 
-    def test_formats_comment_with_metric_name(self) -> None:
-        """Comment includes the metric name."""
-        with patch("api.logic.ragas_evaluator.score_trace") as mock_score:
-            _push_score("trace_1", "context_precision", 0.8)
+        assert first is second
+        fake_modules.ChatOpenAI.assert_called_once()
 
-            call_kwargs = mock_score.call_args[1]
-            assert "context_precision" in call_kwargs["comment"]
+    def test_llm_wrapper_rebuilt_for_different_model(self, fake_modules: MagicMock) -> None:
+        """A different judge model gets its own client."""
+        with patch.dict("os.environ", {}, clear=True):
+            _get_ragas_llm({"endpoint": "http://llm", "model_id": "a"})
+            _get_ragas_llm({"endpoint": "http://llm", "model_id": "b"})
+
+        assert fake_modules.ChatOpenAI.call_count == 2
+
+    def test_embeddings_wrapper_reused_for_same_endpoint(
+        self, fake_modules: MagicMock
+    ) -> None:
+        """Same endpoint/key returns the same embeddings wrapper."""
+        with patch.dict("os.environ", {}, clear=True):
+            first = _get_ragas_embeddings({"endpoint": "http://llm"})
+            second = _get_ragas_embeddings({"endpoint": "http://llm"})
+
+        assert first is not None
+        assert first is second
+        fake_modules.OpenAIEmbeddings.assert_called_once()
+
+    def test_embeddings_failure_returns_none(self, fake_modules: MagicMock) -> None:
+        """Construction errors are logged and yield None instead of raising."""
+        fake_modules.OpenAIEmbeddings.side_effect = RuntimeError("bad config")
+
+        with patch.dict("os.environ", {}, clear=True):
+            assert _get_ragas_embeddings({"endpoint": "http://llm"}) is None
@@ -7,9 +7,14 @@ and that all RAGAS metric instruments are properly defined.
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterator
+
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient, Response
+from prometheus_client.metrics import MetricWrapperBase
 
 from api.middleware.metrics import (
     ragas_context_precision,
@@ -21,77 +26,111 @@ from api.middleware.metrics import (
 )
 
 
-@pytest.fixture()
-def client() -> TestClient:
-    """Create a test client with the metrics router."""
-    app = FastAPI()
-    app.include_router(router)
-    return TestClient(app)
+_RAGAS_METRIC_NAMES = frozenset(
+    {
+        "ragas_faithfulness_score",
+        "ragas_response_relevancy_score",
+        "ragas_context_precision_score",
+        "ragas_evaluations_total",
+        "ragas_evaluation_duration_seconds",
+    }
+)
 
 
-class TestMetricsEndpoint:
-    """Tests for GET /metrics."""
+def _declared_metric_names(exposition: str) -> set[str]:
+    """Collect metric family names from the TYPE lines of a scrape."""
+    return {
+        line.split(" ", 3)[2]
+        for line in exposition.splitlines()
+        if line.startswith("# TYPE ")
+    }
 
-    def test_returns_prometheus_format(self, client: TestClient) -> None:
-        """Endpoint returns text content with Prometheus MIME type."""
-        response = client.get("/metrics")
-        assert response.status_code == 200
-        assert "text/plain" in response.headers["content-type"]
 
-    def test_contains_ragas_faithfulness_metric(self, client: TestClient) -> None:
-        """Response contains ragas_faithfulness_score metric."""
-        response = client.get("/metrics")
-        assert "ragas_faithfulness_score" in response.text
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """Create an app with the metrics router, shared by all tests."""
+    app = FastAPI()
+    app.include_router(router)
+    return app
 
-    def test_contains_ragas_response_relevancy_metric(self, client: TestClient) -> None:
-        """Response contains ragas_response_relevancy_score metric."""
-        response = client.get("/metrics")
-        assert "ragas_response_relevancy_score" in response.text
 
-    def test_contains_ragas_context_precision_metric(self, client: TestClient) -> None:
-        """Response contains ragas_context_precision_score metric."""
-        response = client.get("/metrics")
-        assert "ragas_context_precision_score" in response.text
+@pytest.fixture(scope="session")
+def client(app: FastAPI) -> TestClient:
+    """Create a test client for the shared app."""
+    return TestClient(app)
 
-    def test_contains_ragas_evaluations_total_metric(self, client: TestClient) -> None:
-        """Response contains ragas_evaluations_total metric."""
-        response = client.get("/metrics")
-        assert "ragas_evaluations_total" in response.text
 
-    def test_contains_ragas_evaluation_duration_metric(self, client: TestClient) -> None:
-        """Response contains ragas_evaluation_duration_seconds metric."""
-        response = client.get("/metrics")
-        assert "ragas_evaluation_duration_seconds" in response.text
+@pytest.fixture(scope="session")
+def metrics_response(client: TestClient) -> Response:
+    """Scrape /metrics once; the endpoint is read-only."""
+    return client.get("/metrics")
 
 
-class TestMetricInstruments:
-    """Tests for metric instrument definitions."""
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
 
-    def test_faithfulness_histogram_exists(self) -> None:
-        """Faithfulness histogram is defined with correct name."""
-        assert ragas_faithfulness._name == "ragas_faithfulness_score"
+    @pytest.fixture(scope="class")
+    def metric_names(self, metrics_response: Response) -> set[str]:
+        """Metric family names declared by the shared scrape."""
+        return _declared_metric_names(metrics_response.text)
 
-    def test_response_relevancy_histogram_exists(self) -> None:
-        """Response relevancy histogram is defined with correct name."""
-        assert ragas_response_relevancy._name == "ragas_response_relevancy_score"
+    def test_returns_prometheus_format(self, metrics_response: Response) -> None:
+        """Endpoint returns text content with Prometheus MIME type."""
+        assert metrics_response.status_code == 200
+        assert "text/plain" in metrics_response.headers["content-type"]
+
+    def test_contains_ragas_metrics(self, metric_names: set[str]) -> None:
+        """Response declares every RAGAS metric."""
+        assert _RAGAS_METRIC_NAMES.issubset(metric_names), (
+            _RAGAS_METRIC_NAMES - metric_names
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_scrapes(self, app: FastAPI) -> None:
+        """Concurrent scrapes all succeed and expose the same metric families."""
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as async_client:
+            responses = await asyncio.gather(
+                *(async_client.get("/metrics") for _ in range(8))
+            )
+
+        assert all(response.status_code == 200 for response in responses)
+        assert all(
+            _RAGAS_METRIC_NAMES.issubset(_declared_metric_names(response.text))
+            for response in responses
+        )
 
-    def test_context_precision_histogram_exists(self) -> None:
-        """Context precision histogram is defined with correct name."""
-        assert ragas_context_precision._name == "ragas_context_precision_score"
 
-    def test_evaluations_counter_exists(self) -> None:
-        """Evaluations counter is defined with correct name."""
-        # prometheus_client Counter stores name without _total suffix internally
-        assert ragas_evaluations_total._name == "ragas_evaluations"
+class TestMetricInstruments:
+    """Tests for metric instrument definitions."""
 
-    def test_duration_histogram_exists(self) -> None:
-        """Duration histogram is defined with correct name."""
-        assert ragas_evaluation_duration._name == "ragas_evaluation_duration_seconds"
+    @pytest.fixture
+    def clear_evaluations_counter(self) -> Iterator[None]:
+        """Remove the status series a test adds to the process-wide counter."""
+        yield
+        ragas_evaluations_total.clear()
+
+    @pytest.mark.parametrize(
+        ("instrument", "expected"),
+        [
+            (ragas_faithfulness, "ragas_faithfulness_score"),
+            (ragas_response_relevancy, "ragas_response_relevancy_score"),
+            (ragas_context_precision, "ragas_context_precision_score"),
+            # prometheus_client Counter stores name without _total suffix internally
+            (ragas_evaluations_total, "ragas_evaluations"),
+            (ragas_evaluation_duration, "ragas_evaluation_duration_seconds"),
+        ],
+    )
+    def test_instrument_name(self, instrument: MetricWrapperBase, expected: str) -> None:
+        """Instrument is defined with the correct name."""
+        assert instrument._name == expected
 
     def test_faithfulness_observe(self) -> None:
         """Faithfulness histogram accepts observations."""
         ragas_faithfulness.observe(0.85)
 
+    @pytest.mark.usefixtures("clear_evaluations_counter")
     def test_evaluations_counter_labels(self) -> None:
         """Counter accepts status labels."""
         ragas_evaluations_total.labels(status="success").inc()
@@ -8,10 +8,16 @@ gathering, and error tolerance.
 
 from __future__ import annotations
 
+import itertools
 import uuid
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections.abc import Sequence
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, call
 
 import pytest
+from pydantic import ValidationError
 
 from api.routes.evaluation import (
     BatchEvalRequest,
@@ -19,13 +25,36 @@ from api.routes.evaluation import (
     run_batch_evaluation,
 )
 
+# Pre-generated ids for doubles whose identity does not matter; 64 distinct
+# values is more than any single test draws
+_UUID_POOL = [uuid.uuid4() for _ in range(64)]
+_uuid_iter = itertools.cycle(_UUID_POOL)
+
+# The route only reads the request, so tests share validated instances
+_REQ_LIMIT_10 = BatchEvalRequest(limit=10)
+_REQ_LIMIT_25 = BatchEvalRequest(limit=25)
+
+# Expected maybe_evaluate_async() kwargs for the single-session scenarios
+_EXPECTED_EVAL_CALL_AI = {
+    "trace_id": "trace_batch",
+    "query": "What is AI?",
+    "response": "AI is artificial intelligence.",
+    "contexts": ["AI Overview"],
+}
+_EXPECTED_EVAL_CALL_NO_TITLE = {
+    "trace_id": "trace_batch",
+    "query": "Tell me about AI",
+    "response": "AI is cool",
+    "contexts": [],
+}
+
 
 def _make_session(
     session_id: uuid.UUID | None = None,
     user_id: uuid.UUID | None = None,
     message_count: int = 5,
-) -> MagicMock:
-    """Create a mock ChatSession ORM object.
+) -> SimpleNamespace:
+    """Create a stand-in ChatSession ORM object.
 
     Args:
         session_id: Session UUID.
@@ -33,17 +62,17 @@ def _make_session(
         message_count: Number of messages in session.
 
     Returns:
-        MagicMock configured as a ChatSession.
+        SimpleNamespace shaped like a ChatSession.
     """
-    session = MagicMock()
-    session.id = session_id or uuid.uuid4()
-    session.user_id = user_id or uuid.uuid4()
-    session.message_count = message_count
-    return session
+    return SimpleNamespace(
+        id=session_id or next(_uuid_iter),
+        user_id=user_id or next(_uuid_iter),
+        message_count=message_count,
+    )
 
 
-def _make_message(role: str, content: str, msg_id: uuid.UUID | None = None) -> MagicMock:
-    """Create a mock ChatMessage ORM object.
+def _make_message(role: str, content: str, msg_id: uuid.UUID | None = None) -> SimpleNamespace:
+    """Create a stand-in ChatMessage ORM object.
 
     Args:
         role: Message role ("user" or "assistant").
@@ -51,55 +80,236 @@ def _make_message(role: str, content: str, msg_id: uuid.UUID | None = None) -> M
         msg_id: Optional message UUID.
 
     Returns:
-        MagicMock configured as a ChatMessage.
+        SimpleNamespace shaped like a ChatMessage.
     """
-    msg = MagicMock()
-    msg.id = msg_id or uuid.uuid4()
-    msg.role = role
-    msg.content = content
-    return msg
+    return SimpleNamespace(id=msg_id or next(_uuid_iter), role=role, content=content)
 
 
-def _make_doc_link(document_id: uuid.UUID) -> MagicMock:
-    """Create a mock ChatMessageDocument ORM object.
+def _make_doc_link(document_id: uuid.UUID) -> SimpleNamespace:
+    """Create a stand-in ChatMessageDocument ORM object.
 
     Args:
         document_id: Document UUID.
 
     Returns:
-        MagicMock configured as a ChatMessageDocument.
+        SimpleNamespace shaped like a ChatMessageDocument.
     """
-    link = MagicMock()
-    link.document_id = document_id
-    return link
+    return SimpleNamespace(document_id=document_id)
 
 
-def _make_document(doc_id: uuid.UUID, title: str) -> MagicMock:
-    """Create a mock Document ORM object.
+def _make_document(doc_id: uuid.UUID, title: str | None) -> SimpleNamespace:
+    """Create a stand-in Document ORM object.
 
     Args:
         doc_id: Document UUID.
         title: Document title.
 
     Returns:
-        MagicMock configured as a Document.
+        SimpleNamespace shaped like a Document.
+    """
+    return SimpleNamespace(id=doc_id, title=title)
+
+
+def _make_admin_user() -> SimpleNamespace:
+    """Create a stand-in admin TokenUser.
+
+    Returns:
+        SimpleNamespace shaped like an admin user.
+    """
+    return SimpleNamespace(id=next(_uuid_iter), roles=["admin"])
+
+
+def _scalars_all(items: list) -> MagicMock:
+    """Create a mock execute() result whose scalars().all() returns items.
+
+    Args:
+        items: Rows to return.
+
+    Returns:
+        MagicMock configured as a query result.
+    """
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = items
+    return result
+
+
+def _scalar_one(item: object) -> MagicMock:
+    """Create a mock execute() result whose scalar_one_or_none() returns item.
+
+    Args:
+        item: Row to return, or None.
+
+    Returns:
+        MagicMock configured as a query result.
+    """
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = item
+    return result
+
+
+# Marks the end of a _FakeDB result queue
+_EXHAUSTED = object()
+
+
+class _FakeDB:
+    """Async session stand-in that answers execute() from a result queue.
+
+    Exceptions in the queue are raised instead of returned. The route
+    catches exceptions per session, so an unexpected extra query is also
+    recorded and reported by assert_exhausted().
     """
-    doc = MagicMock()
-    doc.id = doc_id
-    doc.title = title
-    return doc
 
+    __slots__ = ("_results", "_overrun")
+
+    def __init__(self, results: Sequence[Any]) -> None:
+        self._results = iter(results)
+        self._overrun = False
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        value = next(self._results, _EXHAUSTED)
+        if value is _EXHAUSTED:
+            self._overrun = True
+            raise AssertionError("unexpected extra db.execute call")
+        if isinstance(value, BaseException):
+            raise value
+        return value
 
-def _make_admin_user() -> MagicMock:
-    """Create a mock admin TokenUser.
+    def assert_exhausted(self) -> None:
+        """Assert every queued result was consumed and no extra query ran."""
+        assert not self._overrun, "unexpected extra db.execute call"
+        assert next(self._results, _EXHAUSTED) is _EXHAUSTED, "queued db results left unused"
+
+
+def _build_db(
+    *,
+    sessions: list[SimpleNamespace],
+    per_session: Sequence[tuple[list, list | None, list] | BaseException] = (),
+) -> _FakeDB:
+    """Create a db stub that answers the route's queries in order.
+
+    Args:
+        sessions: Sessions returned by the first query.
+        per_session: For each session, (messages, doc_links, documents) in
+            query order, or an exception raised by its messages query.
+            Messages are given newest first, as the route receives them;
+            doc_links is None when the session never reaches that query.
 
     Returns:
-        MagicMock configured as an admin user.
+        _FakeDB whose execute() returns the queued results.
     """
-    user = MagicMock()
-    user.id = uuid.uuid4()
-    user.roles = ["admin"]
-    return user
+    results: list = [_scalars_all(sessions)]
+    for entry in per_session:
+        if isinstance(entry, BaseException):
+            results.append(entry)
+            continue
+        messages, doc_links, documents = entry
+        results.append(_scalars_all(messages))
+        if doc_links is not None:
+            results.append(_scalars_all(doc_links))
+            results.extend(_scalar_one(doc) for doc in documents)
+
+    return _FakeDB(results)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Declarative batch evaluation case.
+
+    Attributes:
+        name: Test id.
+        per_session: One _build_db() entry per session returned by the query.
+        expected: (evaluated, skipped, errors) counters.
+        eval_succeeds: Whether maybe_evaluate_async returns a result.
+        expected_eval_call: maybe_evaluate_async kwargs to check, if any.
+    """
+
+    name: str
+    per_session: tuple[tuple[list, list | None, list] | BaseException, ...]
+    expected: tuple[int, int, int]
+    eval_succeeds: bool = True
+    expected_eval_call: dict[str, Any] | None = None
+
+
+_AI_DOC_ID = next(_uuid_iter)
+_UNTITLED_DOC_ID = next(_uuid_iter)
+
+# Messages are listed newest first, as the route receives them
+_SCENARIOS = [
+    Scenario(
+        name="valid-pair",
+        per_session=(
+            (
+                [
+                    _make_message("assistant", "AI is artificial intelligence."),
+                    _make_message("user", "What is AI?"),
+                ],
+                [_make_doc_link(_AI_DOC_ID)],
+                [_make_document(_AI_DOC_ID, "AI Overview")],
+            ),
+        ),
+        expected=(1, 0, 0),
+        expected_eval_call=_EXPECTED_EVAL_CALL_AI,
+    ),
+    Scenario(
+        name="without-user-message",
+        per_session=(([_make_message("assistant", "Hello!")], None, []),),
+        expected=(0, 1, 0),
+    ),
+    Scenario(
+        name="without-assistant-response",
+        per_session=(([_make_message("user", "Hello?")], None, []),),
+        expected=(0, 1, 0),
+    ),
+    Scenario(
+        name="eval-returns-none",
+        per_session=(
+            (
+                [
+                    _make_message("assistant", "AI is artificial intelligence."),
+                    _make_message("user", "What is AI?"),
+                ],
+                [],
+                [],
+            ),
+        ),
+        expected=(0, 1, 0),
+        eval_succeeds=False,
+    ),
+    Scenario(
+        name="db-error",
+        per_session=(RuntimeError("DB connection lost"),),
+        expected=(0, 0, 1),
+    ),
+    Scenario(
+        name="no-sessions",
+        per_session=(),
+        expected=(0, 0, 0),
+    ),
+    Scenario(
+        name="document-without-title",
+        per_session=(
+            (
+                [
+                    _make_message("assistant", "AI is cool"),
+                    _make_message("user", "Tell me about AI"),
+                ],
+                [_make_doc_link(_UNTITLED_DOC_ID)],
+                [_make_document(_UNTITLED_DOC_ID, None)],
+            ),
+        ),
+        expected=(1, 0, 0),
+        expected_eval_call=_EXPECTED_EVAL_CALL_NO_TITLE,
+    ),
+    Scenario(
+        name="mixed",
+        per_session=(
+            ([_make_message("assistant", "A1"), _make_message("user", "Q1")], [], []),
+            ([_make_message("user", "Q2")], None, []),
+            RuntimeError("DB crashed"),
+        ),
+        expected=(1, 1, 1),
+    ),
+]
 
 
 class TestBatchEvalRequest:
@@ -119,17 +329,17 @@ class TestBatchEvalRequest:
 
     def test_limit_min_validation(self) -> None:
         """Rejects limit below 1."""
-        with pytest.raises(Exception):
+        with pytest.raises(ValidationError):
             BatchEvalRequest(limit=0)
 
     def test_limit_max_validation(self) -> None:
         """Rejects limit above 500."""
-        with pytest.raises(Exception):
+        with pytest.raises(ValidationError):
             BatchEvalRequest(limit=501)
 
     def test_min_messages_validation(self) -> None:
         """Rejects min_messages below 2."""
-        with pytest.raises(Exception):
+        with pytest.raises(ValidationError):
             BatchEvalRequest(min_messages=1)
 
 
@@ -151,348 +361,91 @@ class TestBatchEvalResponse:
         assert resp.errors == 2
 
 
+# One event loop for the whole class; the tests share no loop-bound state
+@pytest.mark.asyncio(loop_scope="class")
 class TestRunBatchEvaluation:
     """Tests for run_batch_evaluation endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_returns_skipped_when_langfuse_disabled(self) -> None:
+    @pytest.fixture(autouse=True)
+    def _enable_langfuse(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Enable Langfuse for every test; the disabled case overrides it."""
+        monkeypatch.setattr("api.routes.evaluation.is_langfuse_enabled", lambda: True)
+
+    @pytest.fixture
+    def langfuse_patches(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> tuple[MagicMock, AsyncMock]:
+        """Patch create_trace and maybe_evaluate_async.
+
+        The trace id is "trace_batch" and the eval result is truthy (counts as
+        evaluated); tests override return values as needed.
+
+        Returns:
+            (mock_create_trace, mock_maybe_evaluate_async)
+        """
+        mock_create = MagicMock(return_value=SimpleNamespace(id="trace_batch"))
+        mock_eval = AsyncMock(return_value=MagicMock())
+        monkeypatch.setattr("api.routes.evaluation.create_trace", mock_create)
+        monkeypatch.setattr("api.routes.evaluation.maybe_evaluate_async", mock_eval)
+        return mock_create, mock_eval
+
+    async def test_returns_skipped_when_langfuse_disabled(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Returns all sessions as skipped when Langfuse is disabled."""
-        with patch(
-            "api.routes.evaluation.is_langfuse_enabled",
-            return_value=False,
-        ):
-            result = await run_batch_evaluation(
-                request=BatchEvalRequest(limit=25),
-                user=_make_admin_user(),
-                db=AsyncMock(),
-            )
-
-            assert result.skipped == 25
-            assert result.evaluated == 0
-            assert result.errors == 0
-
-    @pytest.mark.asyncio
-    async def test_evaluates_sessions_with_valid_pairs(self) -> None:
-        """Evaluates sessions that have user-assistant message pairs."""
-        session = _make_session()
-        user_msg = _make_message("user", "What is AI?")
-        assistant_msg = _make_message("assistant", "AI is artificial intelligence.")
-        doc_id = uuid.uuid4()
-        doc_link = _make_doc_link(doc_id)
-        doc = _make_document(doc_id, "AI Overview")
-
-        mock_trace = MagicMock()
-        mock_trace.id = "trace_123"
-
-        mock_eval_result = MagicMock()  # Truthy → counts as evaluated
-
-        # Build db mock that returns different results for each execute call
-        db = AsyncMock()
-        sessions_result = MagicMock()
-        sessions_result.scalars.return_value.all.return_value = [session]
-
-        # Messages returned in DESC order (newest first), code calls .reverse()
-        messages_result = MagicMock()
-        messages_result.scalars.return_value.all.return_value = [assistant_msg, user_msg]
-
-        doc_links_result = MagicMock()
-        doc_links_result.scalars.return_value.all.return_value = [doc_link]
-
-        doc_result = MagicMock()
-        doc_result.scalar_one_or_none.return_value = doc
-
-        db.execute = AsyncMock(
-            side_effect=[sessions_result, messages_result, doc_links_result, doc_result]
+        monkeypatch.setattr("api.routes.evaluation.is_langfuse_enabled", lambda: False)
+        # No queued results: any query would fail the test
+        db = _FakeDB([])
+
+        result = await run_batch_evaluation(
+            request=_REQ_LIMIT_25,
+            user=_make_admin_user(),
+            db=db,
         )
 
-        with (
-            patch("api.routes.evaluation.is_langfuse_enabled", return_value=True),
-            patch("api.routes.evaluation.create_trace", return_value=mock_trace),
-            patch(
-                "api.routes.evaluation.maybe_evaluate_async",
-                new_callable=AsyncMock,
-                return_value=mock_eval_result,
-            ) as mock_eval,
-        ):
-            result = await run_batch_evaluation(
-                request=BatchEvalRequest(limit=10),
-                user=_make_admin_user(),
-                db=db,
-            )
-
-            assert result.evaluated == 1
-            assert result.skipped == 0
-            assert result.errors == 0
-
-            # Verify eval was called with correct args
-            mock_eval.assert_called_once_with(
-                trace_id="trace_123",
-                query="What is AI?",
-                response="AI is artificial intelligence.",
-                contexts=["AI Overview"],
-            )
-
-    @pytest.mark.asyncio
-    async def test_skips_session_without_user_message(self) -> None:
-        """Skips sessions that only have assistant messages."""
-        session = _make_session()
-        assistant_msg = _make_message("assistant", "Hello!")
-
-        db = AsyncMock()
-        sessions_result = MagicMock()
-        sessions_result.scalars.return_value.all.return_value = [session]
-
-        messages_result = MagicMock()
-        messages_result.scalars.return_value.all.return_value = [assistant_msg]
-
-        db.execute = AsyncMock(side_effect=[sessions_result, messages_result])
-
-        with patch("api.routes.evaluation.is_langfuse_enabled", return_value=True):
-            result = await run_batch_evaluation(
-                request=BatchEvalRequest(limit=10),
-                user=_make_admin_user(),
-                db=db,
-            )
-
-            assert result.skipped == 1
-            assert result.evaluated == 0
-
-    @pytest.mark.asyncio
-    async def test_skips_session_without_assistant_response(self) -> None:
-        """Skips sessions that only have user messages."""
-        session = _make_session()
-        user_msg = _make_message("user", "Hello?")
-
-        db = AsyncMock()
-        sessions_result = MagicMock()
-        sessions_result.scalars.return_value.all.return_value = [session]
-
-        messages_result = MagicMock()
-        messages_result.scalars.return_value.all.return_value = [user_msg]
-
-        db.execute = AsyncMock(side_effect=[sessions_result, messages_result])
-
-        with patch("api.routes.evaluation.is_langfuse_enabled", return_value=True):
-            result = await run_batch_evaluation(
-                request=BatchEvalRequest(limit=10),
-                user=_make_admin_user(),
-                db=db,
-            )
-
-            assert result.skipped == 1
-            assert result.evaluated == 0
-
-    @pytest.mark.asyncio
-    async def test_counts_error_on_session_exception(self) -> None:
-        """Increments errors counter when session processing raises."""
-        session = _make_session()
-
-        db = AsyncMock()
-        sessions_result = MagicMock()
-        sessions_result.scalars.return_value.all.return_value = [session]
-
-        # Simulate DB error when fetching messages
-        db.execute = AsyncMock(
-            side_effect=[sessions_result, RuntimeError("DB connection lost")]
+        db.assert_exhausted()
+
+        assert result.skipped == 25
+        assert result.evaluated == 0
+        assert result.errors == 0
+
+    @pytest.mark.parametrize(
+        "scenario",
+        [pytest.param(scenario, id=scenario.name) for scenario in _SCENARIOS],
+    )
+    async def test_batch_eval(
+        self,
+        scenario: Scenario,
+        langfuse_patches: tuple[MagicMock, AsyncMock],
+    ) -> None:
+        """Counts evaluated, skipped, and errored sessions per scenario."""
+        _, mock_eval = langfuse_patches
+        if not scenario.eval_succeeds:
+            mock_eval.return_value = None
+
+        db = _build_db(
+            sessions=[_make_session() for _ in scenario.per_session],
+            per_session=scenario.per_session,
         )
 
-        with patch("api.routes.evaluation.is_langfuse_enabled", return_value=True):
-            result = await run_batch_evaluation(
-                request=BatchEvalRequest(limit=10),
-                user=_make_admin_user(),
-                db=db,
-            )
-
-            assert result.errors == 1
-            assert result.evaluated == 0
-            assert result.skipped == 0
-
-    @pytest.mark.asyncio
-    async def test_skips_session_when_eval_returns_none(self) -> None:
-        """Counts session as skipped when maybe_evaluate_async returns None."""
-        session = _make_session()
-        user_msg = _make_message("user", "What is AI?")
-        assistant_msg = _make_message("assistant", "AI is artificial intelligence.")
-
-        mock_trace = MagicMock()
-        mock_trace.id = "trace_456"
-
-        db = AsyncMock()
-        sessions_result = MagicMock()
-        sessions_result.scalars.return_value.all.return_value = [session]
-
-        # Messages in DESC order (newest first), code calls .reverse()
-        messages_result = MagicMock()
-        messages_result.scalars.return_value.all.return_value = [assistant_msg, user_msg]
-
-        doc_links_result = MagicMock()
-        doc_links_result.scalars.return_value.all.return_value = []  # No docs
-
-        db.execute = AsyncMock(
-            side_effect=[sessions_result, messages_result, doc_links_result]
+        result = await run_batch_evaluation(
+            request=_REQ_LIMIT_10,
+            user=_make_admin_user(),
+            db=db,
         )
 
-        with (
-            patch("api.routes.evaluation.is_langfuse_enabled", return_value=True),
-            patch("api.routes.evaluation.create_trace", return_value=mock_trace),
-            patch(
-                "api.routes.evaluation.maybe_evaluate_async",
-                new_callable=AsyncMock,
-                return_value=None,
-            ),
-        ):
-            result = await run_batch_evaluation(
-                request=BatchEvalRequest(limit=10),
-                user=_make_admin_user(),
-                db=db,
-            )
-
-            assert result.skipped == 1
-            assert result.evaluated == 0
-
-    @pytest.mark.asyncio
-    async def test_handles_no_sessions_found(self) -> None:
-        """Returns all zeros when no sessions match criteria."""
-        db = AsyncMock()
-        sessions_result = MagicMock()
-        sessions_result.scalars.return_value.all.return_value = []
-
-        db.execute = AsyncMock(return_value=sessions_result)
-
-        with patch("api.routes.evaluation.is_langfuse_enabled", return_value=True):
-            result = await run_batch_evaluation(
-                request=BatchEvalRequest(limit=10),
-                user=_make_admin_user(),
-                db=db,
-            )
-
-            assert result.evaluated == 0
-            assert result.skipped == 0
-            assert result.errors == 0
+        db.assert_exhausted()
+        assert (result.evaluated, result.skipped, result.errors) == scenario.expected
+        if scenario.expected_eval_call is not None:
+            mock_eval.assert_called_once()
+            assert mock_eval.call_args.kwargs == scenario.expected_eval_call
 
-    @pytest.mark.asyncio
-    async def test_skips_documents_without_title(self) -> None:
-        """Skips documents that have no title when building contexts."""
-        session = _make_session()
-        user_msg = _make_message("user", "Tell me about AI")
-        assistant_msg = _make_message("assistant", "AI is cool")
-        doc_id = uuid.uuid4()
-        doc_link = _make_doc_link(doc_id)
-
-        # Document with no title
-        doc_no_title = MagicMock()
-        doc_no_title.id = doc_id
-        doc_no_title.title = None
-
-        mock_trace = MagicMock()
-        mock_trace.id = "trace_789"
-
-        mock_eval_result = MagicMock()
-
-        db = AsyncMock()
-        sessions_result = MagicMock()
-        sessions_result.scalars.return_value.all.return_value = [session]
-
-        # Messages in DESC order (newest first), code calls .reverse()
-        messages_result = MagicMock()
-        messages_result.scalars.return_value.all.return_value = [assistant_msg, user_msg]
-
-        doc_links_result = MagicMock()
-        doc_links_result.scalars.return_value.all.return_value = [doc_link]
-
-        doc_result = MagicMock()
-        doc_result.scalar_one_or_none.return_value = doc_no_title
-
-        db.execute = AsyncMock(
-            side_effect=[sessions_result, messages_result, doc_links_result, doc_result]
-        )
-
-        with (
-            patch("api.routes.evaluation.is_langfuse_enabled", return_value=True),
-            patch("api.routes.evaluation.create_trace", return_value=mock_trace),
-            patch(
-                "api.routes.evaluation.maybe_evaluate_async",
-                new_callable=AsyncMock,
-                return_value=mock_eval_result,
-            ) as mock_eval,
-        ):
-            result = await run_batch_evaluation(
-                request=BatchEvalRequest(limit=10),
-                user=_make_admin_user(),
-                db=db,
-            )
-
-            assert result.evaluated == 1
-            # Context should be empty (doc had no title)
-            mock_eval.assert_called_once_with(
-                trace_id="trace_789",
-                query="Tell me about AI",
-                response="AI is cool",
-                contexts=[],
-            )
-
-    @pytest.mark.asyncio
-    async def test_multiple_sessions_mixed_results(self) -> None:
-        """Handles mix of evaluated, skipped, and errored sessions."""
-        session1 = _make_session()  # Will evaluate
-        session2 = _make_session()  # Will skip (no assistant)
-        session3 = _make_session()  # Will error
-
-        user_msg1 = _make_message("user", "Q1")
-        assistant_msg1 = _make_message("assistant", "A1")
-        user_msg2 = _make_message("user", "Q2")
-
-        mock_trace = MagicMock()
-        mock_trace.id = "trace_multi"
-        mock_eval_result = MagicMock()
-
-        db = AsyncMock()
-        sessions_result = MagicMock()
-        sessions_result.scalars.return_value.all.return_value = [session1, session2, session3]
-
-        # Session 1: valid pair, no docs (DESC order — newest first)
-        msgs1_result = MagicMock()
-        msgs1_result.scalars.return_value.all.return_value = [assistant_msg1, user_msg1]
-        docs1_result = MagicMock()
-        docs1_result.scalars.return_value.all.return_value = []
-
-        # Session 2: only user message
-        msgs2_result = MagicMock()
-        msgs2_result.scalars.return_value.all.return_value = [user_msg2]
-
-        # Session 3: DB error
-        db.execute = AsyncMock(
-            side_effect=[
-                sessions_result,
-                msgs1_result,     # session1 messages
-                docs1_result,     # session1 docs
-                msgs2_result,     # session2 messages
-                RuntimeError("DB crashed"),  # session3 messages
-            ]
-        )
-
-        with (
-            patch("api.routes.evaluation.is_langfuse_enabled", return_value=True),
-            patch("api.routes.evaluation.create_trace", return_value=mock_trace),
-            patch(
-                "api.routes.evaluation.maybe_evaluate_async",
-                new_callable=AsyncMock,
-                return_value=mock_eval_result,
-            ),
-        ):
-            result = await run_batch_evaluation(
-                request=BatchEvalRequest(limit=10),
-                user=_make_admin_user(),
-                db=db,
-            )
-
-            assert result.evaluated == 1
-            assert result.skipped == 1
-            assert result.errors == 1
-
-    @pytest.mark.asyncio
-    async def test_creates_trace_with_correct_metadata(self) -> None:
+    async def test_creates_trace_with_correct_metadata(
+        self, langfuse_patches: tuple[MagicMock, AsyncMock]
+    ) -> None:
         """Creates Langfuse trace with correct user_id, session_id, and tags."""
+        mock_create, mock_eval = langfuse_patches
+
         session_id = uuid.uuid4()
         user_id = uuid.uuid4()
         session = _make_session(session_id=session_id, user_id=user_id)
@@ -500,42 +453,24 @@ class TestRunBatchEvaluation:
         user_msg = _make_message("user", "Q")
         assistant_msg = _make_message("assistant", "A")
 
-        mock_trace = MagicMock()
-        mock_trace.id = "trace_meta"
+        db = _build_db(sessions=[session], per_session=[([assistant_msg, user_msg], [], [])])
 
-        db = AsyncMock()
-        sessions_result = MagicMock()
-        sessions_result.scalars.return_value.all.return_value = [session]
-
-        # Messages in DESC order (newest first), code calls .reverse()
-        messages_result = MagicMock()
-        messages_result.scalars.return_value.all.return_value = [assistant_msg, user_msg]
-
-        doc_links_result = MagicMock()
-        doc_links_result.scalars.return_value.all.return_value = []
-
-        db.execute = AsyncMock(
-            side_effect=[sessions_result, messages_result, doc_links_result]
+        await run_batch_evaluation(
+            request=_REQ_LIMIT_10,
+            user=_make_admin_user(),
+            db=db,
         )
 
-        with (
-            patch("api.routes.evaluation.is_langfuse_enabled", return_value=True),
-            patch("api.routes.evaluation.create_trace", return_value=mock_trace) as mock_create,
-            patch(
-                "api.routes.evaluation.maybe_evaluate_async",
-                new_callable=AsyncMock,
-                return_value=MagicMock(),
-            ),
-        ):
-            await run_batch_evaluation(
-                request=BatchEvalRequest(limit=10),
-                user=_make_admin_user(),
-                db=db,
-            )
-
-            mock_create.assert_called_once_with(
+        db.assert_exhausted()
+        assert mock_create.call_args_list == [
+            call(
                 name="batch-evaluation",
                 user_id=str(user_id),
                 session_id=str(session_id),
                 tags=["batch-eval"],
             )
+        ]
+        # The created trace's id is what the scores are attached to
+        assert mock_eval.call_args_list == [
+            call(trace_id="trace_batch", query="Q", response="A", contexts=[])
+        ]
@@ -1,15 +1,28 @@
 """Unit tests for document management endpoints."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator
+from types import MappingProxyType
+from typing import Any, AsyncGenerator, Iterable, Iterator
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy.sql import Select, operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression
 
+from api.dependencies import get_current_user, get_db_session
+from api.middleware.error_handler import setup_error_handlers
+from api.routes.documents import router as documents_router
+from echomind_lib.db.models import Connector as ConnectorORM
+from echomind_lib.db.models import Document as DocumentORM
+from echomind_lib.db.models import TeamMember as TeamMemberORM
 
-@dataclass
+# Fixed timestamp for mock defaults; datetimes are immutable so one is shared
+_FROZEN_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
 class MockConnector:
     """Mock connector ORM object for testing.
 
@@ -30,13 +43,13 @@ class MockConnector:
     status_message: str | None = None
     last_sync_at: datetime | None = None
     docs_analyzed: int = 0
-    creation_date: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    creation_date: datetime = _FROZEN_NOW
     last_update: datetime | None = None
     user_id_last_update: int | None = None
     deleted_date: datetime | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MockDocument:
     """Mock document ORM object for testing."""
 
@@ -53,7 +66,7 @@ class MockDocument:
     status: str = "completed"
     status_message: str | None = None
     chunk_count: int = 10
-    creation_date: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    creation_date: datetime = _FROZEN_NOW
     last_update: datetime | None = None
     user_id_last_update: int | None = None
     # Connector relationship - loaded via selectinload
@@ -65,7 +78,12 @@ class MockDocument:
             self.connector = MockConnector(id=self.connector_id, user_id=1)
 
 
-@dataclass
+# Shared read-only instances; vary fields with dataclasses.replace()
+_GOLDEN_CONNECTOR = MockConnector(id=1, user_id=1)
+_GOLDEN_DOCUMENT = MockDocument(id=1, connector_id=1, connector=_GOLDEN_CONNECTOR)
+
+
+@dataclass(slots=True)
 class MockTokenUser:
     """Mock authenticated user."""
 
@@ -74,16 +92,28 @@ class MockTokenUser:
     user_name: str = "testuser"
     first_name: str = "Test"
     last_name: str = "User"
-    roles: list[str] = field(default_factory=lambda: ["user"])
-    groups: list[str] = field(default_factory=lambda: ["default"])
+    roles: tuple[str, ...] = ("user",)
+    groups: tuple[str, ...] = ("default",)
     external_id: str = "ext-123"
 
 
+# Shared single-int row tuples so result setters don't rebuild them per test
+_INT_TUPLES = tuple((i,) for i in range(1024))
+
+
+def _int_rows(ids: Iterable[int]) -> list[tuple[int]]:
+    """Return one-column rows for ids, reusing pooled tuples where possible."""
+    return [_INT_TUPLES[i] if 0 <= i < len(_INT_TUPLES) else (i,) for i in ids]
+
+
 class MockResult:
     """Mock SQLAlchemy query result."""
 
+    __slots__ = ("_data", "_first")
+
     def __init__(self, data: list[Any]):
         self._data = data
+        self._first = data[0] if data else None
 
     def scalars(self) -> "MockResult":
         return self
@@ -92,7 +122,52 @@ class MockResult:
         return self._data
 
     def scalar_one_or_none(self) -> Any | None:
-        return self._data[0] if self._data else None
+        return self._first
+
+
+def _filters_on_id(query: Select, model: type) -> bool:
+    """Return True if the query's WHERE clause compares model.id for equality."""
+    if query.whereclause is None:
+        return False
+    return any(
+        isinstance(clause, BinaryExpression)
+        and clause.operator is operators.eq
+        and getattr(clause.left, "table", None) is model.__table__
+        and clause.left.key == "id"
+        for clause in visitors.iterate(query.whereclause)
+    )
+
+
+def _classify_query(query: Any) -> str | None:
+    """Return the MockDbSession result bucket for a query.
+
+    Reads the Select's column descriptions and WHERE clause directly instead
+    of compiling it to SQL text. Returns None for statements it does not
+    recognise, which MockDbSession.execute() reports as a test failure.
+    """
+    if not isinstance(query, Select):
+        return None
+    columns = query.column_descriptions
+    entity = columns[0]["entity"] if columns else None
+    whole_entity = len(columns) == 1 and columns[0]["expr"] is entity
+
+    # Team ID queries (for permissions)
+    if entity is TeamMemberORM:
+        return "team_ids"
+
+    if entity is ConnectorORM:
+        # select(ConnectorORM).where(ConnectorORM.id == X) vs select(ConnectorORM.id)
+        return "connector_objects" if whole_entity else "connector_ids"
+
+    if entity is DocumentORM:
+        if not whole_entity:
+            # select(func.count(DocumentORM.id))
+            return "count"
+        if _filters_on_id(query, DocumentORM):
+            return "single"
+        return "documents"
+
+    return None
 
 
 class MockDbSession:
@@ -111,55 +186,53 @@ class MockDbSession:
         }
         self._call_count = 0
 
+    def reset(self) -> None:
+        """Clear recorded calls and configured results, keeping the lists for reuse.
+
+        Setters copy into these lists rather than rebinding them, so clearing
+        never touches caller-owned data.
+        """
+        self.added.clear()
+        self.deleted.clear()
+        self._call_count = 0
+        for results in self._query_results.values():
+            results.clear()
+
     def set_connector_ids(self, ids: list[int]) -> None:
         """Set connector ID results for ID-only queries."""
-        self._query_results["connector_ids"] = [(i,) for i in ids]
+        self._query_results["connector_ids"][:] = _int_rows(ids)
 
     def set_connector_objects(self, connectors: list[Any]) -> None:
         """Set connector object results for full object queries."""
-        self._query_results["connector_objects"] = connectors
+        self._query_results["connector_objects"][:] = connectors
 
-    def set_connector_results(self, results: list[Any]) -> None:
-        """Legacy method - sets both IDs and objects from tuples or objects.
+    def set_connector_scopes(self, rows: list[tuple[Any, ...]]) -> None:
+        """Set ID and object results from (id, scope, scope_id) tuples.
 
-        If results are tuples (id, scope, scope_id), extract IDs.
-        If results are objects, use them directly.
+        Trailing tuple fields are optional and default to a user-scoped connector.
         """
-        if not results:
-            self._query_results["connector_ids"] = []
-            self._query_results["connector_objects"] = []
-            return
-
-        # Check if first item is a tuple
-        if isinstance(results[0], tuple):
-            # Legacy format: (id, scope, scope_id) - convert to proper mocks
-            self._query_results["connector_ids"] = [(r[0],) for r in results]
-            # Create mock connector objects from tuples
-            mock_connectors = []
-            for r in results:
-                mock_connectors.append(MockConnector(
-                    id=r[0],
-                    scope=r[1] if len(r) > 1 else "user",
-                    scope_id=r[2] if len(r) > 2 else None,
-                ))
-            self._query_results["connector_objects"] = mock_connectors
-        else:
-            # Already proper objects
-            self._query_results["connector_ids"] = [(c.id,) for c in results]
-            self._query_results["connector_objects"] = results
+        self._query_results["connector_ids"][:] = _int_rows(r[0] for r in rows)
+        self._query_results["connector_objects"][:] = [
+            MockConnector(
+                id=r[0],
+                scope=r[1] if len(r) > 1 else "user",
+                scope_id=r[2] if len(r) > 2 else None,
+            )
+            for r in rows
+        ]
 
     def set_document_results(self, results: list[Any]) -> None:
-        self._query_results["documents"] = results
+        self._query_results["documents"][:] = results
 
     def set_count_results(self, count: int) -> None:
-        self._query_results["count"] = [(i,) for i in range(count)]
+        self._query_results["count"][:] = _int_rows(range(count))
 
     def set_single_result(self, result: Any | None) -> None:
-        self._query_results["single"] = [result] if result else []
+        self._query_results["single"][:] = [result] if result else []
 
     def set_team_ids(self, ids: list[int]) -> None:
         """Set team ID results for team membership queries."""
-        self._query_results["team_ids"] = [(i,) for i in ids]
+        self._query_results["team_ids"][:] = _int_rows(ids)
 
     def add(self, obj: Any) -> None:
         self.added.append(obj)
@@ -175,37 +248,47 @@ class MockDbSession:
 
     async def execute(self, query: Any) -> MockResult:
         self._call_count += 1
-        query_str = str(query).lower()
+        bucket = _classify_query(query)
+        if bucket is None:
+            raise AssertionError(f"MockDbSession cannot classify query: {query}")
+        return MockResult(self._query_results[bucket])
+
+
+# Per-test doubles read by the shared app's dependency overrides
+_current: dict[str, Any] = {"db": None, "user": None}
+
+
+async def _override_db() -> AsyncGenerator[MockDbSession, None]:
+    yield _current["db"]
 
-        # Team ID queries (for permissions)
-        if "teams" in query_str and "team_members" in query_str:
-            return MockResult(self._query_results["team_ids"])
 
-        # Full connector object query (for getting connector details)
-        # Pattern: select(ConnectorORM).where(ConnectorORM.id == X)
-        if "connectors" in query_str and "connectors.id =" in query_str and "documents" not in query_str:
-            # Single connector by ID - return from objects list
-            return MockResult(self._query_results["connector_objects"])
+async def _override_user() -> MockTokenUser:
+    return _current["user"]
 
-        # Connector ID-only queries (for listing accessible connectors)
-        # Pattern: select(ConnectorORM.id)
-        if "connectors.id" in query_str and "connectors.name" not in query_str and "documents" not in query_str:
-            return MockResult(self._query_results["connector_ids"])
 
-        # Single document query by ID (with or without joins)
-        # Pattern: select(DocumentORM).where(DocumentORM.id == X)
-        if "documents" in query_str and "documents.id =" in query_str:
-            return MockResult(self._query_results["single"])
+_DEPENDENCY_OVERRIDES = MappingProxyType({
+    get_db_session: _override_db,
+    get_current_user: _override_user,
+})
 
-        # Count query for documents (only selecting ID, not other fields)
-        if "documents.id" in query_str and "documents.title" not in query_str and "documents.id =" not in query_str:
-            return MockResult(self._query_results["count"])
 
-        # List documents query
-        if "documents" in query_str:
-            return MockResult(self._query_results["documents"])
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """Create one test client whose dependencies resolve to the current test's doubles."""
+    app = FastAPI()
+    setup_error_handlers(app)  # Enable error handlers for proper HTTP responses
+    # Registered once per session; freeze so a stray per-test registration raises
+    app.exception_handlers = MappingProxyType(dict(app.exception_handlers))
+    app.include_router(documents_router, prefix="/documents")
+    app.dependency_overrides.update(_DEPENDENCY_OVERRIDES)
 
-        return MockResult([])
+    return TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture(scope="session")
+def shared_db() -> MockDbSession:
+    """Create one database double that each test resets after use."""
+    return MockDbSession()
 
 
 class TestDocumentEndpoints:
@@ -216,34 +299,22 @@ class TestDocumentEndpoints:
         return MockTokenUser()
 
     @pytest.fixture
-    def mock_db(self) -> MockDbSession:
-        return MockDbSession()
+    def mock_db(self, shared_db: MockDbSession) -> Iterator[MockDbSession]:
+        yield shared_db
+        shared_db.reset()
 
-    @pytest.fixture
-    def client(
+    @pytest.fixture(autouse=True)
+    def _bind_dependencies(
         self,
         mock_db: MockDbSession,
         mock_user: MockTokenUser,
-    ) -> TestClient:
-        """Create test client with mocked dependencies."""
-        from api.dependencies import get_current_user, get_db_session
-        from api.middleware.error_handler import setup_error_handlers
-        from api.routes.documents import router
-
-        app = FastAPI()
-        setup_error_handlers(app)  # Enable error handlers for proper HTTP responses
-        app.include_router(router, prefix="/documents")
-
-        async def override_db() -> AsyncGenerator[MockDbSession, None]:
-            yield mock_db
-
-        async def override_user() -> MockTokenUser:
-            return mock_user
-
-        app.dependency_overrides[get_db_session] = override_db
-        app.dependency_overrides[get_current_user] = override_user
-
-        return TestClient(app, raise_server_exceptions=False)
+    ) -> Iterator[None]:
+        """Point the shared app at this test's database and user."""
+        _current["db"] = mock_db
+        _current["user"] = mock_user
+        yield
+        _current["db"] = None
+        _current["user"] = None
 
     def test_list_documents_no_connectors(
         self,
@@ -251,23 +322,7 @@ class TestDocumentEndpoints:
         mock_db: MockDbSession,
     ) -> None:
         """Test listing documents when user has no connectors."""
-        mock_db.set_connector_results([])
-
-        response = client.get("/documents")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["documents"] == []
-
-    def test_list_documents_empty(
-        self,
-        client: TestClient,
-        mock_db: MockDbSession,
-    ) -> None:
-        """Test listing documents when connectors have no documents."""
-        mock_db.set_connector_results([(1,)])
-        mock_db.set_document_results([])
-        mock_db.set_count_results(0)
+        mock_db.set_connector_ids([])
 
         response = client.get("/documents")
 
@@ -275,68 +330,37 @@ class TestDocumentEndpoints:
         data = response.json()
         assert data["documents"] == []
 
-    def test_list_documents_with_results(
-        self,
-        client: TestClient,
-        mock_db: MockDbSession,
-    ) -> None:
-        """Test listing documents returns correct data."""
-        mock_db.set_connector_results([(1,)])
-        document = MockDocument(id=1, connector_id=1)
-        mock_db.set_document_results([document])
-        mock_db.set_count_results(1)
-
-        response = client.get("/documents")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["documents"]) == 1
-        assert data["documents"][0]["title"] == "Test Document"
-
-    def test_list_documents_connector_filter(
-        self,
-        client: TestClient,
-        mock_db: MockDbSession,
-    ) -> None:
-        """Test listing documents filtered by connector."""
-        mock_db.set_connector_results([(1,)])
-        document = MockDocument(id=1, connector_id=1)
-        mock_db.set_document_results([document])
-        mock_db.set_count_results(1)
-
-        response = client.get("/documents?connector_id=1")
-
-        assert response.status_code == 200
-
-    def test_list_documents_status_filter(
-        self,
-        client: TestClient,
-        mock_db: MockDbSession,
-    ) -> None:
-        """Test listing documents filtered by status."""
-        mock_db.set_connector_results([(1,)])
-        document = MockDocument(id=1, status="pending")
-        mock_db.set_document_results([document])
-        mock_db.set_count_results(1)
-
-        response = client.get("/documents?doc_status=pending")
-
-        assert response.status_code == 200
-
-    def test_list_documents_pagination(
+    @pytest.mark.parametrize(
+        ("query_string", "documents", "count", "expected_titles"),
+        [
+            ("", [], 0, []),
+            ("", [_GOLDEN_DOCUMENT], 1, ["Test Document"]),
+            ("?connector_id=1", [_GOLDEN_DOCUMENT], 1, None),
+            ("?doc_status=pending", [replace(_GOLDEN_DOCUMENT, status="pending")], 1, None),
+            ("?page=1&limit=2", [replace(_GOLDEN_DOCUMENT, id=i) for i in range(1, 6)], 5, None),
+        ],
+        ids=["empty", "with_results", "connector_filter", "status_filter", "pagination"],
+    )
+    def test_list_documents(
         self,
         client: TestClient,
         mock_db: MockDbSession,
+        query_string: str,
+        documents: list[MockDocument],
+        count: int,
+        expected_titles: list[str] | None,
     ) -> None:
-        """Test listing documents with pagination."""
-        mock_db.set_connector_results([(1,)])
-        documents = [MockDocument(id=i) for i in range(1, 6)]
+        """Test listing documents with filters and pagination."""
+        mock_db.set_connector_scopes([(1,)])
         mock_db.set_document_results(documents)
-        mock_db.set_count_results(5)
+        mock_db.set_count_results(count)
 
-        response = client.get("/documents?page=1&limit=2")
+        response = client.get(f"/documents{query_string}")
 
         assert response.status_code == 200
+        if expected_titles is not None:
+            data = response.json()
+            assert [d["title"] for d in data["documents"]] == expected_titles
 
     def test_get_document_success(
         self,
@@ -344,8 +368,7 @@ class TestDocumentEndpoints:
         mock_db: MockDbSession,
     ) -> None:
         """Test getting a single document by ID."""
-        document = MockDocument(id=1, connector_id=1)
-        mock_db.set_single_result(document)
+        mock_db.set_single_result(_GOLDEN_DOCUMENT)
 
         response = client.get("/documents/1")
 
@@ -387,13 +410,12 @@ class TestDocumentEndpoints:
         mock_db: MockDbSession,
     ) -> None:
         """Test deleting a document."""
-        document = MockDocument(id=1, connector_id=1)
-        mock_db.set_single_result(document)
+        mock_db.set_single_result(_GOLDEN_DOCUMENT)
 
         response = client.delete("/documents/1")
 
         assert response.status_code == 204
-        assert document in mock_db.deleted
+        assert _GOLDEN_DOCUMENT in mock_db.deleted
 
     def test_delete_document_not_found(
         self,
@@ -413,7 +435,7 @@ class TestDocumentEndpoints:
         mock_db: MockDbSession,
     ) -> None:
         """Test searching documents when user has no connectors."""
-        mock_db.set_connector_results([])
+        mock_db.set_connector_ids([])
 
         response = client.get("/documents/search?query=test")
 
@@ -427,7 +449,7 @@ class TestDocumentEndpoints:
         mock_db: MockDbSession,
     ) -> None:
         """Test searching documents with no matches."""
-        mock_db.set_connector_results([(1, "user", None)])
+        mock_db.set_connector_scopes([(1, "user", None)])
 
         response = client.get("/documents/search?query=nonexistent")
 
@@ -441,7 +463,7 @@ class TestDocumentEndpoints:
         mock_db: MockDbSession,
     ) -> None:
         """Test searching documents with connector filter."""
-        mock_db.set_connector_results([(1, "user", None)])
+        mock_db.set_connector_scopes([(1, "user", None)])
 
         response = client.get("/documents/search?query=test&connector_id=1")
 
@@ -453,7 +475,7 @@ class TestDocumentEndpoints:
         mock_db: MockDbSession,
     ) -> None:
         """Test searching documents with limit parameter."""
-        mock_db.set_connector_results([(1, "user", None)])
+        mock_db.set_connector_scopes([(1, "user", None)])
 
         response = client.get("/documents/search?query=test&limit=5")
 
@@ -465,7 +487,7 @@ class TestDocumentEndpoints:
         mock_db: MockDbSession,
     ) -> None:
         """Test searching documents with min_score parameter."""
-        mock_db.set_connector_results([(1, "user", None)])
+        mock_db.set_connector_scopes([(1, "user", None)])
 
         response = client.get("/documents/search?query=test&min_score=0.7")
 
@@ -1,79 +1,144 @@
 """Unit tests for Google OAuth2 endpoints."""
 
 import time
-from typing import AsyncGenerator
+from dataclasses import dataclass, replace
+from types import SimpleNamespace
+from typing import AsyncGenerator, AsyncIterator, Iterator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from fastapi import FastAPI
-from fastapi.testclient import TestClient
+import pytest_asyncio
+from fastapi import FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient, Response
 
+from api.dependencies import get_current_user, get_db_session
 from api.routes.google_oauth import (
     _cleanup_expired_states,
     _google_oauth_states,
     _STATE_TTL_SECONDS,
+    google_auth_callback,
     router,
 )
 
 
-@pytest.fixture
-def _mock_user() -> MagicMock:
-    """Create a mock authenticated user with id=1."""
-    user = MagicMock()
-    user.id = 1
-    user.email = "test@example.com"
-    return user
+@pytest.fixture(scope="module")
+def _mock_user() -> SimpleNamespace:
+    """Create a mock authenticated user with id=1, shared by the module."""
+    return SimpleNamespace(id=1, email="test@example.com")
+
+
+async def _async_noop(*args: object, **kwargs: object) -> None:
+    """Awaitable stand-in for session methods whose calls are not asserted."""
 
 
 @pytest.fixture
 def _mock_db() -> MagicMock:
-    """Create a mock async DB session."""
+    """Create a mock async DB session.
+
+    commit and delete are plain coroutines; tests that assert on them
+    replace them with AsyncMock.
+    """
     db = MagicMock()
-    db.commit = AsyncMock()
+    db.commit = _async_noop
     db.add = MagicMock()
-    db.delete = AsyncMock()
+    db.delete = _async_noop
     return db
 
 
-@pytest.fixture
-def client(_mock_user: MagicMock, _mock_db: MagicMock) -> TestClient:
-    """Create a test client with the Google OAuth router and mocked deps."""
-    from api.dependencies import get_current_user, get_db_session
-
+@pytest.fixture(scope="module")
+def _app(_mock_user: SimpleNamespace) -> FastAPI:
+    """Create the Google OAuth app once per module with the user override installed."""
     app = FastAPI()
     app.include_router(router, prefix="/google")
 
-    async def override_user() -> MagicMock:
+    async def override_user() -> SimpleNamespace:
         return _mock_user
 
+    app.dependency_overrides[get_current_user] = override_user
+    return app
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def _module_client(_app: FastAPI) -> AsyncIterator[AsyncClient]:
+    """Create one async client for the shared app on the module event loop."""
+    async with AsyncClient(
+        transport=ASGITransport(app=_app), base_url="http://test"
+    ) as async_client:
+        yield async_client
+
+
+@pytest.fixture
+def client(
+    _app: FastAPI, _module_client: AsyncClient, _mock_db: MagicMock
+) -> Iterator[AsyncClient]:
+    """Point the shared app at this test's mock DB session."""
+
     async def override_db() -> AsyncGenerator[MagicMock, None]:
         yield _mock_db
 
-    app.dependency_overrides[get_current_user] = override_user
-    app.dependency_overrides[get_db_session] = override_db
+    _app.dependency_overrides[get_db_session] = override_db
+    yield _module_client
+    _app.dependency_overrides.pop(get_db_session, None)
+
 
-    return TestClient(app)
+@dataclass(frozen=True, slots=True)
+class _SettingsStub:
+    """Read-only stand-in for the Settings fields the OAuth routes use."""
 
+    google_client_id: str | None = "test-client-id"
+    google_client_secret: str | None = "test-secret"
+    google_redirect_uri: str | None = "https://example.com/callback"
+    oauth_frontend_url: str | None = "https://app.example.com"
 
-def _mock_settings(**overrides: object) -> MagicMock:
+
+_DEFAULT_SETTINGS = _SettingsStub()
+
+
+def _mock_settings(**overrides: str | None) -> _SettingsStub:
     """Create mock settings with sensible defaults.
 
     Args:
         **overrides: Fields to override on the mock settings.
 
     Returns:
-        MagicMock configured as Settings instance.
+        Settings stub with the overrides applied.
     """
-    settings = MagicMock()
-    settings.google_client_id = overrides.get("google_client_id", "test-client-id")
-    settings.google_client_secret = overrides.get("google_client_secret", "test-secret")
-    settings.google_redirect_uri = overrides.get(
-        "google_redirect_uri", "https://example.com/callback"
-    )
-    settings.oauth_frontend_url = overrides.get(
-        "oauth_frontend_url", "https://app.example.com"
-    )
-    return settings
+    return replace(_DEFAULT_SETTINGS, **overrides)
+
+
+@pytest.fixture(autouse=True)
+def patched_settings() -> Iterator[MagicMock]:
+    """Patch get_settings for every test with default mock settings.
+
+    Tests that need different settings assign a new ``return_value``.
+    """
+    with patch("api.routes.google_oauth.get_settings") as mock_get_settings:
+        mock_get_settings.return_value = _mock_settings()
+        yield mock_get_settings
+
+
+@pytest.fixture
+def mock_client_cls() -> Iterator[MagicMock]:
+    """Patch the httpx.AsyncClient class used for token exchange and revocation."""
+    with patch("api.routes.google_oauth.httpx.AsyncClient") as mock_cls:
+        yield mock_cls
+
+
+@pytest.fixture(autouse=True)
+def _reset_states() -> Iterator[None]:
+    """Start and finish every test with an empty OAuth state store."""
+    _google_oauth_states.clear()
+    yield
+    _google_oauth_states.clear()
+
+
+# Shared empty query result; nothing asserts on it, so one instance serves every test
+_NO_CREDENTIAL_RESULT = SimpleNamespace(scalar_one_or_none=lambda: None)
+
+
+async def _execute_no_credential(*args: object, **kwargs: object) -> SimpleNamespace:
+    """Awaitable db.execute stand-in that always finds no credential."""
+    return _NO_CREDENTIAL_RESULT
 
 
 def _mock_no_credential(mock_db: MagicMock) -> None:
@@ -82,16 +147,14 @@ def _mock_no_credential(mock_db: MagicMock) -> None:
     Args:
         mock_db: Mock database session.
     """
-    mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = None
-    mock_db.execute = AsyncMock(return_value=mock_result)
+    mock_db.execute = _execute_no_credential
 
 
 def _mock_existing_credential(
     mock_db: MagicMock,
     granted_scopes: list[str] | None = None,
     access_token: str = "existing_token",
-) -> MagicMock:
+) -> SimpleNamespace:
     """Configure mock DB to return an existing credential.
 
     Args:
@@ -102,10 +165,11 @@ def _mock_existing_credential(
     Returns:
         The mock credential object.
     """
-    credential = MagicMock()
-    credential.granted_scopes = granted_scopes or []
-    credential.access_token = access_token
-    credential.refresh_token = "existing_refresh"
+    credential = SimpleNamespace(
+        granted_scopes=granted_scopes or [],
+        access_token=access_token,
+        refresh_token="existing_refresh",
+    )
 
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = credential
@@ -113,6 +177,21 @@ def _mock_existing_credential(
     return credential
 
 
+class _FakeAsyncClient:
+    """Stand-in for an httpx.AsyncClient context manager with a mocked post()."""
+
+    __slots__ = ("post",)
+
+    def __init__(self, post_response: Response) -> None:
+        self.post = AsyncMock(return_value=post_response)
+
+    async def __aenter__(self) -> "_FakeAsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> bool:
+        return False
+
+
 def _mock_token_exchange(
     mock_client_cls: MagicMock,
     access_token: str = "test_access_token",
@@ -131,31 +210,27 @@ def _mock_token_exchange(
         status_code: HTTP status code.
         text: Response text (for errors).
     """
-    mock_token_response = MagicMock()
-    mock_token_response.status_code = status_code
-    mock_token_response.text = text
-
-    response_data: dict[str, object] = {
-        "access_token": access_token,
-        "expires_in": 3600,
-        "scope": scope,
-    }
-    if refresh_token:
-        response_data["refresh_token"] = refresh_token
-    mock_token_response.json.return_value = response_data
-
-    mock_client = AsyncMock()
-    mock_client.post.return_value = mock_token_response
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=False)
-    mock_client_cls.return_value = mock_client
-
-
+    if status_code != 200:
+        token_response = Response(status_code, text=text)
+    else:
+        response_data: dict[str, object] = {
+            "access_token": access_token,
+            "expires_in": 3600,
+            "scope": scope,
+        }
+        if refresh_token:
+            response_data["refresh_token"] = refresh_token
+        token_response = Response(status_code, json=response_data)
+
+    mock_client_cls.return_value = _FakeAsyncClient(token_response)
+
+
+@pytest.mark.asyncio(loop_scope="module")
 class TestGoogleOAuthConfigured:
     """Tests for GET /auth/configured endpoint."""
 
-    def test_configured_returns_true_when_all_vars_set(
-        self, client: TestClient
+    async def test_configured_returns_true_when_all_vars_set(
+        self, client: AsyncClient
     ) -> None:
         """
         Test endpoint returns configured=true when all OAuth vars are set.
@@ -164,18 +239,15 @@ class TestGoogleOAuthConfigured:
         When: GET /google/auth/configured
         Then: Returns {"configured": true}
         """
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            response = client.get("/google/auth/configured")
+        response = await client.get("/google/auth/configured")
 
         assert response.status_code == 200
         data = response.json()
         assert data["configured"] is True
         assert "message" not in data or data.get("message") is None
 
-    def test_configured_returns_false_when_client_id_missing(
-        self, client: TestClient
+    async def test_configured_returns_false_when_client_id_missing(
+        self, client: AsyncClient, patched_settings: MagicMock
     ) -> None:
         """
         Test endpoint returns configured=false when CLIENT_ID is missing.
@@ -184,10 +256,9 @@ class TestGoogleOAuthConfigured:
         When: GET /google/auth/configured
         Then: Returns {"configured": false, "message": "..."}
         """
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings(google_client_id=None)
+        patched_settings.return_value = _mock_settings(google_client_id=None)
 
-            response = client.get("/google/auth/configured")
+        response = await client.get("/google/auth/configured")
 
         assert response.status_code == 200
         data = response.json()
@@ -195,64 +266,60 @@ class TestGoogleOAuthConfigured:
         assert "Google OAuth not configured" in data["message"]
         assert "GOOGLE_CLIENT_ID" in data["message"]
 
-    def test_configured_returns_false_when_client_secret_missing(
-        self, client: TestClient
+    async def test_configured_returns_false_when_client_secret_missing(
+        self, client: AsyncClient, patched_settings: MagicMock
     ) -> None:
         """Test endpoint returns false when CLIENT_SECRET is missing."""
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings(google_client_secret=None)
+        patched_settings.return_value = _mock_settings(google_client_secret=None)
 
-            response = client.get("/google/auth/configured")
+        response = await client.get("/google/auth/configured")
 
         assert response.status_code == 200
         data = response.json()
         assert data["configured"] is False
         assert "message" in data
 
-    def test_configured_returns_false_when_redirect_uri_missing(
-        self, client: TestClient
+    async def test_configured_returns_false_when_redirect_uri_missing(
+        self, client: AsyncClient, patched_settings: MagicMock
     ) -> None:
         """Test endpoint returns false when REDIRECT_URI is missing."""
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings(google_redirect_uri=None)
+        patched_settings.return_value = _mock_settings(google_redirect_uri=None)
 
-            response = client.get("/google/auth/configured")
+        response = await client.get("/google/auth/configured")
 
         assert response.status_code == 200
         data = response.json()
         assert data["configured"] is False
         assert "message" in data
 
-    def test_configured_returns_false_when_all_vars_missing(
-        self, client: TestClient
+    async def test_configured_returns_false_when_all_vars_missing(
+        self, client: AsyncClient, patched_settings: MagicMock
     ) -> None:
         """Test endpoint returns false when no OAuth vars are set."""
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings(
-                google_client_id=None,
-                google_client_secret=None,
-                google_redirect_uri=None,
-            )
+        patched_settings.return_value = _mock_settings(
+            google_client_id=None,
+            google_client_secret=None,
+            google_redirect_uri=None,
+        )
 
-            response = client.get("/google/auth/configured")
+        response = await client.get("/google/auth/configured")
 
         assert response.status_code == 200
         data = response.json()
         assert data["configured"] is False
         assert "message" in data
 
-    def test_configured_returns_false_with_empty_strings(
-        self, client: TestClient
+    async def test_configured_returns_false_with_empty_strings(
+        self, client: AsyncClient, patched_settings: MagicMock
     ) -> None:
         """Test endpoint treats empty strings as not configured."""
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings(
-                google_client_id="",
-                google_client_secret="",
-                google_redirect_uri="",
-            )
+        patched_settings.return_value = _mock_settings(
+            google_client_id="",
+            google_client_secret="",
+            google_redirect_uri="",
+        )
 
-            response = client.get("/google/auth/configured")
+        response = await client.get("/google/auth/configured")
 
         assert response.status_code == 200
         data = response.json()
@@ -260,129 +327,88 @@ class TestGoogleOAuthConfigured:
         assert "message" in data
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestGoogleAuthUrl:
     """Tests for GET /auth/url endpoint."""
 
-    def test_generates_url_with_service_scopes(
-        self, client: TestClient, _mock_db: MagicMock
+    @pytest.mark.parametrize(
+        ("service", "expected_scope", "forbidden_scope"),
+        [
+            ("gmail", "gmail.readonly", "drive.readonly"),
+            ("drive", "drive.readonly", None),
+            ("calendar", "calendar.readonly", None),
+            ("contacts", "contacts.readonly", None),
+        ],
+    )
+    async def test_generates_url_with_service_scopes(
+        self,
+        client: AsyncClient,
+        _mock_db: MagicMock,
+        service: str,
+        expected_scope: str,
+        forbidden_scope: str | None,
     ) -> None:
         """Test URL generation includes only scopes for the requested service."""
         _mock_no_credential(_mock_db)
 
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            response = client.get("/google/auth/url?service=gmail")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert "url" in data
-        assert "accounts.google.com" in data["url"]
-        assert "gmail.readonly" in data["url"]
-        # Should NOT include drive scopes
-        assert "drive.readonly" not in data["url"]
-
-    def test_generates_url_with_drive_scopes(
-        self, client: TestClient, _mock_db: MagicMock
-    ) -> None:
-        """Test URL generation with drive service includes drive scopes."""
-        _mock_no_credential(_mock_db)
-
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            response = client.get("/google/auth/url?service=drive")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert "drive.readonly" in data["url"]
-
-    def test_generates_url_with_calendar_scopes(
-        self, client: TestClient, _mock_db: MagicMock
-    ) -> None:
-        """Test URL generation with calendar service."""
-        _mock_no_credential(_mock_db)
-
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            response = client.get("/google/auth/url?service=calendar")
-
-        assert response.status_code == 200
-        assert "calendar.readonly" in response.json()["url"]
-
-    def test_generates_url_with_contacts_scopes(
-        self, client: TestClient, _mock_db: MagicMock
-    ) -> None:
-        """Test URL generation with contacts service."""
-        _mock_no_credential(_mock_db)
-
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            response = client.get("/google/auth/url?service=contacts")
+        response = await client.get(f"/google/auth/url?service={service}")
 
         assert response.status_code == 200
-        assert "contacts.readonly" in response.json()["url"]
+        url = response.json()["url"]
+        assert "accounts.google.com" in url
+        assert expected_scope in url
+        if forbidden_scope is not None:
+            assert forbidden_scope not in url
 
-    def test_requires_service_param(self, client: TestClient) -> None:
+    async def test_requires_service_param(self, client: AsyncClient) -> None:
         """Test that service parameter is required."""
-        response = client.get("/google/auth/url")
+        response = await client.get("/google/auth/url")
         assert response.status_code == 422  # Validation error
 
-    def test_rejects_invalid_service(self, client: TestClient) -> None:
+    async def test_rejects_invalid_service(self, client: AsyncClient) -> None:
         """Test that invalid service is rejected."""
-        response = client.get("/google/auth/url?service=invalid")
+        response = await client.get("/google/auth/url?service=invalid")
         assert response.status_code == 422
 
-    def test_consent_prompt_for_new_user(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_consent_prompt_for_new_user(
+        self, client: AsyncClient, _mock_db: MagicMock
     ) -> None:
         """Test prompt=consent when user has no existing credential."""
         _mock_no_credential(_mock_db)
 
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            response = client.get("/google/auth/url?service=drive")
+        response = await client.get("/google/auth/url?service=drive")
 
         assert "prompt=consent" in response.json()["url"]
 
-    def test_select_account_prompt_for_existing_user(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_select_account_prompt_for_existing_user(
+        self, client: AsyncClient, _mock_db: MagicMock
     ) -> None:
         """Test prompt=select_account when user has existing credential."""
         _mock_existing_credential(_mock_db)
 
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            response = client.get("/google/auth/url?service=gmail")
+        response = await client.get("/google/auth/url?service=gmail")
 
         assert "prompt=select_account" in response.json()["url"]
 
-    def test_returns_501_when_not_configured(self, client: TestClient) -> None:
+    async def test_returns_501_when_not_configured(
+        self, client: AsyncClient, patched_settings: MagicMock
+    ) -> None:
         """Test 501 when Google OAuth is not configured."""
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings(
-                google_client_id=None, google_redirect_uri=None
-            )
+        patched_settings.return_value = _mock_settings(
+            google_client_id=None, google_redirect_uri=None
+        )
 
-            response = client.get("/google/auth/url?service=drive")
+        response = await client.get("/google/auth/url?service=drive")
 
         assert response.status_code == 501
 
-    def test_state_stored_with_service_and_mode(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_state_stored_with_service_and_mode(
+        self, client: AsyncClient, _mock_db: MagicMock
     ) -> None:
         """Test that state stores user_id, service, mode, and timestamp."""
-        _google_oauth_states.clear()
         _mock_no_credential(_mock_db)
 
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            client.get("/google/auth/url?service=gmail&mode=popup")
+        await client.get("/google/auth/url?service=gmail&mode=popup")
 
         assert len(_google_oauth_states) == 1
         state_key = next(iter(_google_oauth_states))
@@ -392,153 +418,114 @@ class TestGoogleAuthUrl:
         assert mode == "popup"
         assert isinstance(created_at, float)
 
-        _google_oauth_states.clear()
-
-    def test_default_mode_is_redirect(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_default_mode_is_redirect(
+        self, client: AsyncClient, _mock_db: MagicMock
     ) -> None:
         """Test default mode is redirect when not specified."""
-        _google_oauth_states.clear()
         _mock_no_credential(_mock_db)
 
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            client.get("/google/auth/url?service=drive")
+        await client.get("/google/auth/url?service=drive")
 
         state_key = next(iter(_google_oauth_states))
         _, _, mode, _ = _google_oauth_states[state_key]
         assert mode == "redirect"
 
-        _google_oauth_states.clear()
-
-    def test_include_granted_scopes_in_url(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_include_granted_scopes_in_url(
+        self, client: AsyncClient, _mock_db: MagicMock
     ) -> None:
         """Test that include_granted_scopes=true is in URL."""
         _mock_no_credential(_mock_db)
 
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            response = client.get("/google/auth/url?service=drive")
+        response = await client.get("/google/auth/url?service=drive")
 
         assert "include_granted_scopes=true" in response.json()["url"]
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestGoogleAuthCallback:
     """Tests for GET /auth/callback endpoint."""
 
-    def test_callback_with_error_redirects(self, client: TestClient) -> None:
+    async def test_callback_with_error_redirects(self, client: AsyncClient) -> None:
         """Test callback with error parameter redirects to frontend."""
         # State with redirect mode
         _google_oauth_states["err_state"] = (1, "drive", "redirect", time.monotonic())
 
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            response = client.get(
-                "/google/auth/callback",
-                params={"error": "access_denied", "state": "err_state"},
-                follow_redirects=False,
-            )
+        response = await client.get(
+            "/google/auth/callback",
+            params={"error": "access_denied", "state": "err_state"},
+            follow_redirects=False,
+        )
 
         assert response.status_code == 302
         assert "error=access_denied" in response.headers["location"]
-        _google_oauth_states.clear()
 
-    def test_callback_with_error_popup_returns_html(self, client: TestClient) -> None:
+    async def test_callback_with_error_popup_returns_html(self, client: AsyncClient) -> None:
         """Test callback with error in popup mode returns HTML."""
         _google_oauth_states["popup_err"] = (1, "gmail", "popup", time.monotonic())
 
-        with patch("api.routes.google_oauth.get_settings") as mock_settings:
-            mock_settings.return_value = _mock_settings()
-
-            response = client.get(
-                "/google/auth/callback",
-                params={"error": "access_denied", "state": "popup_err"},
-            )
+        response = await client.get(
+            "/google/auth/callback",
+            params={"error": "access_denied", "state": "popup_err"},
+        )
 
         assert response.status_code == 200
         assert "google-oauth-error" in response.text
         assert "access_denied" in response.text
-        _google_oauth_states.clear()
 
-    def test_callback_invalid_state_returns_400(self, client: TestClient) -> None:
+    async def test_callback_invalid_state_returns_400(self, _mock_db: MagicMock) -> None:
         """Test callback with invalid state returns 400."""
-        response = client.get(
-            "/google/auth/callback",
-            params={"code": "auth_code", "state": "invalid_state"},
-        )
+        with pytest.raises(HTTPException) as exc_info:
+            await google_auth_callback(db=_mock_db, code="auth_code", state="invalid_state")
 
-        assert response.status_code == 400
+        assert exc_info.value.status_code == 400
 
-    def test_callback_missing_state_returns_400(self, client: TestClient) -> None:
+    async def test_callback_missing_state_returns_400(self, _mock_db: MagicMock) -> None:
         """Test callback without state returns 400."""
-        response = client.get(
-            "/google/auth/callback",
-            params={"code": "auth_code"},
-        )
+        with pytest.raises(HTTPException) as exc_info:
+            await google_auth_callback(db=_mock_db, code="auth_code")
 
-        assert response.status_code == 400
+        assert exc_info.value.status_code == 400
 
-    def test_callback_missing_code_returns_400(self, client: TestClient) -> None:
+    async def test_callback_missing_code_returns_400(self, _mock_db: MagicMock) -> None:
         """Test callback without code returns 400."""
         _google_oauth_states["test_state"] = (1, "drive", "redirect", time.monotonic())
 
-        response = client.get(
-            "/google/auth/callback",
-            params={"state": "test_state"},
-        )
+        with pytest.raises(HTTPException) as exc_info:
+            await google_auth_callback(db=_mock_db, state="test_state")
 
-        assert response.status_code == 400
-        _google_oauth_states.clear()
+        assert exc_info.value.status_code == 400
 
-    def test_callback_success_redirect_mode(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_callback_success_redirect_mode(
+        self, client: AsyncClient, mock_client_cls: MagicMock, _mock_db: MagicMock
     ) -> None:
         """Test successful callback in redirect mode creates credentials and redirects."""
         _google_oauth_states["valid_state"] = (1, "gmail", "redirect", time.monotonic())
         _mock_no_credential(_mock_db)
+        _mock_token_exchange(mock_client_cls)
 
-        with (
-            patch("api.routes.google_oauth.get_settings") as mock_settings,
-            patch("api.routes.google_oauth.httpx.AsyncClient") as mock_client_cls,
-        ):
-            mock_settings.return_value = _mock_settings()
-            _mock_token_exchange(mock_client_cls)
-
-            response = client.get(
-                "/google/auth/callback",
-                params={"code": "auth_code", "state": "valid_state"},
-                follow_redirects=False,
-            )
+        response = await client.get(
+            "/google/auth/callback",
+            params={"code": "auth_code", "state": "valid_state"},
+            follow_redirects=False,
+        )
 
         assert response.status_code == 302
         assert "/connectors/google/setup" in response.headers["location"]
         assert "valid_state" not in _google_oauth_states
         assert _mock_db.add.called
 
-        _google_oauth_states.clear()
-
-    def test_callback_success_popup_mode(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_callback_success_popup_mode(
+        self, client: AsyncClient, mock_client_cls: MagicMock, _mock_db: MagicMock
     ) -> None:
         """Test successful callback in popup mode returns HTML with postMessage."""
         _google_oauth_states["popup_state"] = (1, "gmail", "popup", time.monotonic())
         _mock_no_credential(_mock_db)
+        _mock_token_exchange(mock_client_cls)
 
-        with (
-            patch("api.routes.google_oauth.get_settings") as mock_settings,
-            patch("api.routes.google_oauth.httpx.AsyncClient") as mock_client_cls,
-        ):
-            mock_settings.return_value = _mock_settings()
-            _mock_token_exchange(mock_client_cls)
-
-            response = client.get(
-                "/google/auth/callback",
-                params={"code": "auth_code", "state": "popup_state"},
-            )
+        response = await client.get(
+            "/google/auth/callback",
+            params={"code": "auth_code", "state": "popup_state"},
+        )
 
         assert response.status_code == 200
         assert "google-oauth-success" in response.text
@@ -546,10 +533,8 @@ class TestGoogleAuthCallback:
         assert "window.opener.postMessage" in response.text
         assert _mock_db.add.called
 
-        _google_oauth_states.clear()
-
-    def test_callback_scope_merging(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_callback_scope_merging(
+        self, client: AsyncClient, mock_client_cls: MagicMock, _mock_db: MagicMock
     ) -> None:
         """Test that new scopes are merged with existing scopes."""
         _google_oauth_states["merge_state"] = (1, "gmail", "redirect", time.monotonic())
@@ -563,19 +548,13 @@ class TestGoogleAuthCallback:
         )
 
         new_scope = "https://www.googleapis.com/auth/gmail.readonly"
+        _mock_token_exchange(mock_client_cls, scope=new_scope)
 
-        with (
-            patch("api.routes.google_oauth.get_settings") as mock_settings,
-            patch("api.routes.google_oauth.httpx.AsyncClient") as mock_client_cls,
-        ):
-            mock_settings.return_value = _mock_settings()
-            _mock_token_exchange(mock_client_cls, scope=new_scope)
-
-            response = client.get(
-                "/google/auth/callback",
-                params={"code": "auth_code", "state": "merge_state"},
-                follow_redirects=False,
-            )
+        response = await client.get(
+            "/google/auth/callback",
+            params={"code": "auth_code", "state": "merge_state"},
+            follow_redirects=False,
+        )
 
         assert response.status_code == 302
         # Credential should have merged scopes (drive + gmail)
@@ -585,64 +564,49 @@ class TestGoogleAuthCallback:
         assert "https://www.googleapis.com/auth/drive.metadata.readonly" in merged
         assert len(merged) == 3
 
-        _google_oauth_states.clear()
-
-    def test_callback_token_exchange_failure_returns_401(
-        self, client: TestClient
+    async def test_callback_token_exchange_failure_returns_401(
+        self, client: AsyncClient, mock_client_cls: MagicMock
     ) -> None:
         """Test callback returns 401 when token exchange fails."""
         _google_oauth_states["fail_state"] = (1, "drive", "redirect", time.monotonic())
+        _mock_token_exchange(mock_client_cls, status_code=400, text="invalid_grant")
 
-        with (
-            patch("api.routes.google_oauth.get_settings") as mock_settings,
-            patch("api.routes.google_oauth.httpx.AsyncClient") as mock_client_cls,
-        ):
-            mock_settings.return_value = _mock_settings()
-            _mock_token_exchange(mock_client_cls, status_code=400, text="invalid_grant")
-
-            response = client.get(
-                "/google/auth/callback",
-                params={"code": "bad_code", "state": "fail_state"},
-            )
+        response = await client.get(
+            "/google/auth/callback",
+            params={"code": "bad_code", "state": "fail_state"},
+        )
 
         assert response.status_code == 401
-        _google_oauth_states.clear()
 
-    def test_callback_no_refresh_token_returns_401(
-        self, client: TestClient
+    async def test_callback_no_refresh_token_returns_401(
+        self, client: AsyncClient, mock_client_cls: MagicMock
     ) -> None:
         """Test callback returns 401 when no refresh token received."""
         _google_oauth_states["no_refresh_state"] = (
             1, "drive", "redirect", time.monotonic()
         )
+        _mock_token_exchange(mock_client_cls, refresh_token=None)
 
-        with (
-            patch("api.routes.google_oauth.get_settings") as mock_settings,
-            patch("api.routes.google_oauth.httpx.AsyncClient") as mock_client_cls,
-        ):
-            mock_settings.return_value = _mock_settings()
-            _mock_token_exchange(mock_client_cls, refresh_token=None)
-
-            response = client.get(
-                "/google/auth/callback",
-                params={"code": "auth_code", "state": "no_refresh_state"},
-            )
+        response = await client.get(
+            "/google/auth/callback",
+            params={"code": "auth_code", "state": "no_refresh_state"},
+        )
 
         assert response.status_code == 401
         assert "refresh token" in response.json()["detail"].lower()
-        _google_oauth_states.clear()
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestGoogleAuthStatus:
     """Tests for GET /auth/status endpoint."""
 
-    def test_status_not_connected(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_status_not_connected(
+        self, client: AsyncClient, _mock_db: MagicMock
     ) -> None:
         """Test status when user has no Google credentials."""
         _mock_no_credential(_mock_db)
 
-        response = client.get("/google/auth/status")
+        response = await client.get("/google/auth/status")
 
         assert response.status_code == 200
         data = response.json()
@@ -653,8 +617,8 @@ class TestGoogleAuthStatus:
         assert data["services"]["calendar"] is False
         assert data["services"]["contacts"] is False
 
-    def test_status_connected_with_drive(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_status_connected_with_drive(
+        self, client: AsyncClient, _mock_db: MagicMock
     ) -> None:
         """Test status when user has Drive scopes granted."""
         _mock_existing_credential(
@@ -665,7 +629,7 @@ class TestGoogleAuthStatus:
             ],
         )
 
-        response = client.get("/google/auth/status")
+        response = await client.get("/google/auth/status")
 
         assert response.status_code == 200
         data = response.json()
@@ -675,8 +639,8 @@ class TestGoogleAuthStatus:
         assert data["services"]["calendar"] is False
         assert data["services"]["contacts"] is False
 
-    def test_status_connected_with_multiple_services(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_status_connected_with_multiple_services(
+        self, client: AsyncClient, _mock_db: MagicMock
     ) -> None:
         """Test status with multiple services authorized."""
         _mock_existing_credential(
@@ -689,7 +653,7 @@ class TestGoogleAuthStatus:
             ],
         )
 
-        response = client.get("/google/auth/status")
+        response = await client.get("/google/auth/status")
 
         data = response.json()
         assert data["services"]["drive"] is True
@@ -698,33 +662,31 @@ class TestGoogleAuthStatus:
         assert data["services"]["contacts"] is False
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestGoogleAuthRevoke:
     """Tests for DELETE /auth endpoint."""
 
-    def test_revoke_no_credentials_returns_404(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_revoke_no_credentials_returns_404(
+        self, client: AsyncClient, _mock_db: MagicMock
     ) -> None:
         """Test revoke when user has no credentials."""
         _mock_no_credential(_mock_db)
 
-        response = client.delete("/google/auth")
+        response = await client.delete("/google/auth")
 
         assert response.status_code == 404
 
-    def test_revoke_success(
-        self, client: TestClient, _mock_db: MagicMock
+    async def test_revoke_success(
+        self, client: AsyncClient, mock_client_cls: MagicMock, _mock_db: MagicMock
     ) -> None:
         """Test successful revoke deletes credentials."""
+        _mock_db.commit = AsyncMock()
+        _mock_db.delete = AsyncMock()
         mock_credential = _mock_existing_credential(_mock_db)
 
-        with patch("api.routes.google_oauth.httpx.AsyncClient") as mock_client_cls:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = MagicMock(status_code=200)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_client_cls.return_value = mock_client
+        mock_client_cls.return_value = _FakeAsyncClient(Response(200))
 
-            response = client.delete("/google/auth")
+        response = await client.delete("/google/auth")
 
         assert response.status_code == 204
         _mock_db.delete.assert_called_once_with(mock_credential)
@@ -734,42 +696,23 @@ class TestGoogleAuthRevoke:
 class TestCleanupExpiredStates:
     """Tests for TTL-based state cleanup."""
 
-    def test_cleanup_removes_expired_states(self) -> None:
-        """Test expired states are removed."""
-        _google_oauth_states.clear()
-
-        _google_oauth_states["expired"] = (
-            1,
-            "drive",
-            "redirect",
-            time.monotonic() - _STATE_TTL_SECONDS - 10,
-        )
-        _google_oauth_states["valid"] = (2, "gmail", "popup", time.monotonic())
-
-        _cleanup_expired_states()
-
-        assert "expired" not in _google_oauth_states
-        assert "valid" in _google_oauth_states
-
-        _google_oauth_states.clear()
-
-    def test_cleanup_noop_when_empty(self) -> None:
-        """Test cleanup does nothing on empty dict."""
-        _google_oauth_states.clear()
-
-        _cleanup_expired_states()
-
-        assert len(_google_oauth_states) == 0
-
-    def test_cleanup_keeps_valid_states(self) -> None:
-        """Test cleanup preserves non-expired states."""
-        _google_oauth_states.clear()
-
-        _google_oauth_states["fresh1"] = (1, "drive", "redirect", time.monotonic())
-        _google_oauth_states["fresh2"] = (2, "gmail", "popup", time.monotonic())
+    @pytest.mark.parametrize(
+        ("state_ages", "expected_keys"),
+        [
+            ({"expired": _STATE_TTL_SECONDS + 10, "valid": 0}, {"valid"}),
+            ({}, set()),
+            ({"fresh1": 0, "fresh2": 0}, {"fresh1", "fresh2"}),
+        ],
+        ids=["removes_expired", "noop_when_empty", "keeps_valid"],
+    )
+    def test_cleanup_expired_states(
+        self, state_ages: dict[str, float], expected_keys: set[str]
+    ) -> None:
+        """Test cleanup drops states older than the TTL and keeps the rest."""
+        now = time.monotonic()
+        for key, age in state_ages.items():
+            _google_oauth_states[key] = (1, "drive", "redirect", now - age)
 
         _cleanup_expired_states()
 
-        assert len(_google_oauth_states) == 2
-
-        _google_oauth_states.clear()
+        assert set(_google_oauth_states) == expected_keys
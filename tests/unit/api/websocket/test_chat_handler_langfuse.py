@@ -8,25 +8,74 @@ and RAGAS evaluation task firing in _process_chat().
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from api.logic.chat_service import RetrievedSource
+from api.websocket import chat_handler
 from api.websocket.chat_handler import ChatHandler, MessageType
 
+# pytest tests/ runs in strict asyncio mode (no root config); every test here is async
+pytestmark = pytest.mark.asyncio
 
-@pytest.fixture
+
+class _FakeChatService:
+    """ChatService stand-in that returns canned results and streams fixed tokens."""
+
+    __slots__ = ("session", "sources", "titles", "user_message", "assistant_message", "tokens")
+
+    def __init__(
+        self,
+        *,
+        session: object,
+        sources: list[RetrievedSource],
+        user_message: object,
+        titles: dict[int, str] | None = None,
+        assistant_message: object = None,
+        tokens: tuple[str, ...] = (),
+    ) -> None:
+        self.session = session
+        self.sources = sources
+        self.titles = titles or {}
+        self.user_message = user_message
+        self.assistant_message = assistant_message
+        self.tokens = tokens
+
+    async def get_session(self, *args: object, **kwargs: object) -> object:
+        return self.session
+
+    async def retrieve_context(self, *args: object, **kwargs: object) -> list[RetrievedSource]:
+        return self.sources
+
+    async def get_document_titles(self, *args: object, **kwargs: object) -> dict[int, str]:
+        return self.titles
+
+    async def save_user_message(self, *args: object, **kwargs: object) -> object:
+        return self.user_message
+
+    async def save_assistant_message(self, *args: object, **kwargs: object) -> object:
+        return self.assistant_message
+
+    async def stream_response(self, **kwargs: object) -> AsyncIterator[str]:
+        for token in self.tokens:
+            yield token
+
+
+@pytest.fixture(scope="module")
 def mock_db() -> AsyncMock:
-    """Create mock database session."""
+    """Create mock database session shared by the module."""
     db = AsyncMock()
     db.commit = AsyncMock()
     return db
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_manager() -> MagicMock:
-    """Create mock connection manager."""
+    """Create mock connection manager shared by the module."""
     manager = MagicMock()
     manager.connect = AsyncMock()
     manager.disconnect = MagicMock()
@@ -35,43 +84,81 @@ def mock_manager() -> MagicMock:
     return manager
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def handler(mock_db: AsyncMock, mock_manager: MagicMock) -> ChatHandler:
     """Create ChatHandler with mocked dependencies."""
     return ChatHandler(db=mock_db, manager=mock_manager)
 
 
-@pytest.fixture
-def mock_user() -> MagicMock:
-    """Create mock TokenUser."""
-    user = MagicMock()
-    user.id = 42
-    user.email = "test@example.com"
-    return user
+@pytest.fixture(autouse=True)
+def reset_mocks(mock_db: AsyncMock, mock_manager: MagicMock) -> Iterator[None]:
+    """Clear call history on the shared mocks after each test."""
+    yield
+    mock_db.reset_mock()
+    mock_manager.reset_mock()
+
+
+@pytest.fixture(autouse=True)
+def patched_handler_deps(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replace the chat handler's service and client factories for every test.
+
+    Tests configure the returned mocks: ``create_trace.return_value`` for the
+    trace, ``service_cls.return_value`` for the ChatService instance, and
+    ``maybe_evaluate`` for RAGAS evaluation assertions.
+    """
+    deps = SimpleNamespace(
+        create_trace=MagicMock(),
+        service_cls=MagicMock(),
+        maybe_evaluate=AsyncMock(),
+    )
+    monkeypatch.setattr(chat_handler, "create_trace", deps.create_trace)
+    monkeypatch.setattr(chat_handler, "get_qdrant", MagicMock)
+    monkeypatch.setattr(chat_handler, "get_embedder_client", MagicMock)
+    monkeypatch.setattr(chat_handler, "get_llm_client", MagicMock)
+    monkeypatch.setattr(chat_handler, "ChatService", deps.service_cls)
+    monkeypatch.setattr(chat_handler, "maybe_evaluate_async", deps.maybe_evaluate)
+    return deps
 
 
 @pytest.fixture
-def mock_session() -> MagicMock:
-    """Create mock chat session with assistant and LLM."""
-    session = MagicMock()
-    session.id = 1
-
-    llm = MagicMock()
-    llm.model_id = "llama-3-70b"
-    llm.provider = "tgi"
-    llm.temperature = 0.7
-    llm.max_tokens = 2048
-    llm.endpoint = "http://tgi:8080"
-    llm.api_key = "test-key"
-
-    assistant = MagicMock()
-    assistant.llm = llm
-    session.assistant = assistant
-
-    return session
+def trace_mocks(
+    request: pytest.FixtureRequest, patched_handler_deps: SimpleNamespace
+) -> SimpleNamespace:
+    """Install a mock trace with span and generation children as the created trace.
+
+    The trace id defaults to "trace-123"; override it with indirect parametrization.
+    """
+    trace = MagicMock()
+    trace.id = getattr(request, "param", "trace-123")
+    span = MagicMock()
+    trace.span.return_value = span
+    gen = MagicMock()
+    trace.generation.return_value = gen
+    patched_handler_deps.create_trace.return_value = trace
+    return SimpleNamespace(trace=trace, span=span, gen=gen)
+
+
+@pytest.fixture(scope="session")
+def mock_user() -> SimpleNamespace:
+    """Create mock TokenUser."""
+    return SimpleNamespace(id=42, email="test@example.com")
 
 
 @pytest.fixture
+def mock_session() -> SimpleNamespace:
+    """Create mock chat session with assistant and LLM."""
+    llm = SimpleNamespace(
+        model_id="llama-3-70b",
+        provider="tgi",
+        temperature=0.7,
+        max_tokens=2048,
+        endpoint="http://tgi:8080",
+        api_key="test-key",
+    )
+    return SimpleNamespace(id=1, assistant=SimpleNamespace(llm=llm))
+
+
+@pytest.fixture(scope="session")
 def mock_sources() -> list[RetrievedSource]:
     """Create mock retrieved sources."""
     return [
@@ -92,555 +179,241 @@ def mock_sources() -> list[RetrievedSource]:
     ]
 
 
+def _assert_trace_created(create_trace: MagicMock) -> None:
+    """Assert the chat trace was created once with user, session and mode."""
+    create_trace.assert_called_once_with(
+        name="chat-completion",
+        user_id="42",
+        session_id="1",
+        metadata={"mode": "chat"},
+        tags=["chat", "chat"],
+    )
+
+
+def _assert_retrieval_span(trace: MagicMock, span: MagicMock, query: str) -> None:
+    """Assert the retrieval span recorded the query input and source scores."""
+    trace.span.assert_called_once_with(
+        name="retrieval",
+        input={"query": query, "limit": 5, "min_score": 0.4},
+    )
+    span.end.assert_called_once()
+    end_kwargs = span.end.call_args[1]
+    assert end_kwargs["output"]["source_count"] == 2
+    assert len(end_kwargs["output"]["scores"]) == 2
+    assert end_kwargs["output"]["scores"][0] == 0.95
+
+
+def _assert_generation(trace: MagicMock, gen: MagicMock, query: str, response: str) -> None:
+    """Assert the generation recorded model info, output, usage and elapsed time."""
+    trace.generation.assert_called_once_with(
+        name="llm-completion",
+        model="llama-3-70b",
+        input={"query": query, "source_count": 2},
+        metadata={
+            "provider": "tgi",
+            "temperature": 0.7,
+            "max_tokens": 2048,
+        },
+    )
+    gen.end.assert_called_once()
+    end_kwargs = gen.end.call_args[1]
+    assert end_kwargs["output"] == response
+    assert end_kwargs["usage"] == {"total_tokens": 3}
+    assert "elapsed_seconds" in end_kwargs["metadata"]
+
+
+def _assert_ragas_fired(maybe_evaluate: AsyncMock, query: str, response: str) -> None:
+    """Assert RAGAS evaluation was awaited with the trace, contexts and LLM config."""
+    maybe_evaluate.assert_awaited_once_with(
+        trace_id="trace-123",
+        query=query,
+        response=response,
+        contexts=[
+            "Test content for retrieval.",
+            "More test content.",
+        ],
+        llm_config={
+            "endpoint": "http://tgi:8080",
+            "model_id": "llama-3-70b",
+            "api_key": "test-key",
+        },
+    )
+
+
+def _assert_tokens_streamed(manager: MagicMock) -> None:
+    """Assert each token and a single completion message were sent to the client."""
+    # Tally message types in one pass over the sent messages
+    messages = [call[0][1] for call in manager.send_to_user.call_args_list]
+    counts = Counter(message.get("type") for message in messages)
+    assert counts[MessageType.GENERATION_TOKEN] == 3
+    assert counts[MessageType.GENERATION_COMPLETE] == 1
+
+    complete = next(
+        message
+        for message in reversed(messages)
+        if message.get("type") == MessageType.GENERATION_COMPLETE
+    )
+    assert complete["token_count"] == 3
+
+
 class TestChatHandlerTraceCreation:
     """Tests for Langfuse trace creation in _process_chat()."""
 
-    @pytest.mark.asyncio
-    async def test_creates_trace_on_chat_start(
+    async def test_process_chat_emits_full_trace(
         self,
+        patched_handler_deps: SimpleNamespace,
+        trace_mocks: SimpleNamespace,
         handler: ChatHandler,
-        mock_user: MagicMock,
-        mock_session: MagicMock,
+        mock_user: SimpleNamespace,
+        mock_session: SimpleNamespace,
         mock_sources: list[RetrievedSource],
         mock_manager: MagicMock,
-        mock_db: AsyncMock,
     ) -> None:
-        """Verify create_trace is called with correct parameters."""
-        mock_trace = MagicMock()
-        mock_trace.id = "trace-123"
-        mock_span = MagicMock()
-        mock_trace.span.return_value = mock_span
-        mock_gen = MagicMock()
-        mock_trace.generation.return_value = mock_gen
-
+        """Verify a chat run records trace, spans, RAGAS evaluation and streamed tokens."""
         mock_user_msg = MagicMock()
         mock_user_msg.id = 10
         mock_assistant_msg = MagicMock()
         mock_assistant_msg.id = 11
 
-        with (
-            patch(
-                "api.websocket.chat_handler.create_trace",
-                return_value=mock_trace,
-            ) as mock_create,
-            patch(
-                "api.websocket.chat_handler.get_qdrant",
-                return_value=MagicMock(),
-            ),
-            patch(
-                "api.websocket.chat_handler.get_embedder_client",
-                return_value=AsyncMock(),
-            ),
-            patch(
-                "api.websocket.chat_handler.get_llm_client",
-                return_value=AsyncMock(),
-            ),
-            patch(
-                "api.websocket.chat_handler.ChatService",
-            ) as mock_service_cls,
-            patch(
-                "api.websocket.chat_handler.maybe_evaluate_async",
-                new_callable=AsyncMock,
-            ),
-        ):
-            service = mock_service_cls.return_value
-            service.get_session = AsyncMock(return_value=mock_session)
-            service.retrieve_context = AsyncMock(return_value=mock_sources)
-            service.get_document_titles = AsyncMock(return_value={1: "Test Document", 2: "Another Doc"})
-            service.save_user_message = AsyncMock(return_value=mock_user_msg)
-            service.save_assistant_message = AsyncMock(return_value=mock_assistant_msg)
-
-            # Simulate streaming with two tokens
-            async def mock_stream(**kwargs):
-                yield "Hello"
-                yield " world"
-
-            service.stream_response = mock_stream
-
-            await handler._process_chat(mock_user, session_id=1, query="test query", mode="chat")
-
-            mock_create.assert_called_once_with(
-                name="chat-completion",
-                user_id="42",
-                session_id="1",
-                metadata={"mode": "chat"},
-                tags=["chat", "chat"],
-            )
-
-    @pytest.mark.asyncio
+        patched_handler_deps.service_cls.return_value = _FakeChatService(
+            session=mock_session,
+            sources=mock_sources,
+            titles={1: "Test Document", 2: "Another Doc"},
+            user_message=mock_user_msg,
+            assistant_message=mock_assistant_msg,
+            tokens=("Hello", " ", "world"),
+        )
+
+        await handler._process_chat(mock_user, session_id=1, query="test query", mode="chat")
+        # Let the fire-and-forget evaluation task run on the next loop tick
+        await asyncio.sleep(0)
+
+        _assert_trace_created(patched_handler_deps.create_trace)
+        _assert_retrieval_span(trace_mocks.trace, trace_mocks.span, "test query")
+        _assert_generation(trace_mocks.trace, trace_mocks.gen, "test query", "Hello world")
+        _assert_ragas_fired(patched_handler_deps.maybe_evaluate, "test query", "Hello world")
+        _assert_tokens_streamed(mock_manager)
+
     async def test_trace_updated_on_error(
         self,
+        patched_handler_deps: SimpleNamespace,
+        trace_mocks: SimpleNamespace,
         handler: ChatHandler,
-        mock_user: MagicMock,
+        mock_user: SimpleNamespace,
         mock_manager: MagicMock,
     ) -> None:
         """Verify trace.update() is called with error metadata on exception."""
-        mock_trace = MagicMock()
-        mock_trace.id = "trace-err"
-
-        with (
-            patch(
-                "api.websocket.chat_handler.create_trace",
-                return_value=mock_trace,
-            ),
-            patch(
-                "api.websocket.chat_handler.get_qdrant",
-                return_value=MagicMock(),
-            ),
-            patch(
-                "api.websocket.chat_handler.get_embedder_client",
-                return_value=AsyncMock(),
-            ),
-            patch(
-                "api.websocket.chat_handler.get_llm_client",
-                return_value=AsyncMock(),
-            ),
-            patch(
-                "api.websocket.chat_handler.ChatService",
-                side_effect=RuntimeError("Service init failed"),
-            ),
-        ):
-            await handler._process_chat(mock_user, session_id=1, query="test", mode="chat")
-
-            mock_trace.update.assert_called_once()
-            call_kwargs = mock_trace.update.call_args[1]
-            assert call_kwargs["metadata"]["error"] is True
-            assert "Service init failed" in call_kwargs["metadata"]["error_message"]
-
-
-class TestChatHandlerRetrievalSpan:
-    """Tests for retrieval span creation and tracking."""
-
-    @pytest.mark.asyncio
-    async def test_creates_retrieval_span(
-        self,
-        handler: ChatHandler,
-        mock_user: MagicMock,
-        mock_session: MagicMock,
-        mock_sources: list[RetrievedSource],
-        mock_manager: MagicMock,
-        mock_db: AsyncMock,
-    ) -> None:
-        """Verify retrieval span is created with correct input and output."""
-        mock_trace = MagicMock()
-        mock_trace.id = "trace-123"
-        mock_span = MagicMock()
-        mock_trace.span.return_value = mock_span
-        mock_gen = MagicMock()
-        mock_trace.generation.return_value = mock_gen
+        patched_handler_deps.service_cls.side_effect = RuntimeError("Service init failed")
 
-        mock_user_msg = MagicMock()
-        mock_user_msg.id = 10
-        mock_assistant_msg = MagicMock()
-        mock_assistant_msg.id = 11
+        await handler._process_chat(mock_user, session_id=1, query="test", mode="chat")
 
-        with (
-            patch(
-                "api.websocket.chat_handler.create_trace",
-                return_value=mock_trace,
-            ),
-            patch("api.websocket.chat_handler.get_qdrant", return_value=MagicMock()),
-            patch("api.websocket.chat_handler.get_embedder_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.get_llm_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.ChatService") as mock_service_cls,
-            patch("api.websocket.chat_handler.maybe_evaluate_async", new_callable=AsyncMock),
-        ):
-            service = mock_service_cls.return_value
-            service.get_session = AsyncMock(return_value=mock_session)
-            service.retrieve_context = AsyncMock(return_value=mock_sources)
-            service.get_document_titles = AsyncMock(return_value={})
-            service.save_user_message = AsyncMock(return_value=mock_user_msg)
-            service.save_assistant_message = AsyncMock(return_value=mock_assistant_msg)
-
-            async def mock_stream(**kwargs):
-                yield "token"
-
-            service.stream_response = mock_stream
-
-            await handler._process_chat(mock_user, session_id=1, query="search query", mode="chat")
-
-            # Verify span created with retrieval name and input
-            mock_trace.span.assert_called_once_with(
-                name="retrieval",
-                input={"query": "search query", "limit": 5, "min_score": 0.4},
-            )
-
-            # Verify span ended with output
-            mock_span.end.assert_called_once()
-            end_kwargs = mock_span.end.call_args[1]
-            assert end_kwargs["output"]["source_count"] == 2
-            assert len(end_kwargs["output"]["scores"]) == 2
-            assert end_kwargs["output"]["scores"][0] == 0.95
+        trace_mocks.trace.update.assert_called_once()
+        call_kwargs = trace_mocks.trace.update.call_args[1]
+        assert call_kwargs["metadata"]["error"] is True
+        assert "Service init failed" in call_kwargs["metadata"]["error_message"]
 
 
 class TestChatHandlerGenerationSpan:
     """Tests for LLM generation span creation and recording."""
 
-    @pytest.mark.asyncio
-    async def test_creates_generation_span(
-        self,
-        handler: ChatHandler,
-        mock_user: MagicMock,
-        mock_session: MagicMock,
-        mock_sources: list[RetrievedSource],
-        mock_manager: MagicMock,
-        mock_db: AsyncMock,
-    ) -> None:
-        """Verify generation span records model, tokens, and elapsed time."""
-        mock_trace = MagicMock()
-        mock_trace.id = "trace-123"
-        mock_span = MagicMock()
-        mock_trace.span.return_value = mock_span
-        mock_gen = MagicMock()
-        mock_trace.generation.return_value = mock_gen
-
-        mock_user_msg = MagicMock()
-        mock_user_msg.id = 10
-        mock_assistant_msg = MagicMock()
-        mock_assistant_msg.id = 11
-
-        with (
-            patch("api.websocket.chat_handler.create_trace", return_value=mock_trace),
-            patch("api.websocket.chat_handler.get_qdrant", return_value=MagicMock()),
-            patch("api.websocket.chat_handler.get_embedder_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.get_llm_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.ChatService") as mock_service_cls,
-            patch("api.websocket.chat_handler.maybe_evaluate_async", new_callable=AsyncMock),
-        ):
-            service = mock_service_cls.return_value
-            service.get_session = AsyncMock(return_value=mock_session)
-            service.retrieve_context = AsyncMock(return_value=mock_sources)
-            service.get_document_titles = AsyncMock(return_value={})
-            service.save_user_message = AsyncMock(return_value=mock_user_msg)
-            service.save_assistant_message = AsyncMock(return_value=mock_assistant_msg)
-
-            async def mock_stream(**kwargs):
-                yield "Hello"
-                yield " world"
-                yield "!"
-
-            service.stream_response = mock_stream
-
-            await handler._process_chat(mock_user, session_id=1, query="test", mode="chat")
-
-            # Verify generation created with model info
-            mock_trace.generation.assert_called_once_with(
-                name="llm-completion",
-                model="llama-3-70b",
-                input={"query": "test", "source_count": 2},
-                metadata={
-                    "provider": "tgi",
-                    "temperature": 0.7,
-                    "max_tokens": 2048,
-                },
-            )
-
-            # Verify generation ended with output and usage
-            mock_gen.end.assert_called_once()
-            end_kwargs = mock_gen.end.call_args[1]
-            assert end_kwargs["output"] == "Hello world!"
-            assert end_kwargs["usage"] == {"total_tokens": 3}
-            assert "elapsed_seconds" in end_kwargs["metadata"]
-
-    @pytest.mark.asyncio
     async def test_search_mode_skips_generation(
         self,
+        patched_handler_deps: SimpleNamespace,
+        trace_mocks: SimpleNamespace,
         handler: ChatHandler,
-        mock_user: MagicMock,
-        mock_session: MagicMock,
+        mock_user: SimpleNamespace,
+        mock_session: SimpleNamespace,
         mock_sources: list[RetrievedSource],
         mock_manager: MagicMock,
         mock_db: AsyncMock,
     ) -> None:
         """Verify search mode does not create a generation span."""
-        mock_trace = MagicMock()
-        mock_trace.id = "trace-123"
-        mock_span = MagicMock()
-        mock_trace.span.return_value = mock_span
-
         mock_user_msg = MagicMock()
         mock_user_msg.id = 10
 
-        with (
-            patch("api.websocket.chat_handler.create_trace", return_value=mock_trace),
-            patch("api.websocket.chat_handler.get_qdrant", return_value=MagicMock()),
-            patch("api.websocket.chat_handler.get_embedder_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.get_llm_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.ChatService") as mock_service_cls,
-        ):
-            service = mock_service_cls.return_value
-            service.get_session = AsyncMock(return_value=mock_session)
-            service.retrieve_context = AsyncMock(return_value=mock_sources)
-            service.get_document_titles = AsyncMock(return_value={})
-            service.save_user_message = AsyncMock(return_value=mock_user_msg)
+        patched_handler_deps.service_cls.return_value = _FakeChatService(
+            session=mock_session,
+            sources=mock_sources,
+            user_message=mock_user_msg,
+        )
 
-            await handler._process_chat(mock_user, session_id=1, query="test", mode="search")
+        await handler._process_chat(mock_user, session_id=1, query="test", mode="search")
 
-            # Generation should not be called in search mode
-            mock_trace.generation.assert_not_called()
+        # Generation should not be called in search mode
+        trace_mocks.trace.generation.assert_not_called()
 
 
 class TestChatHandlerRagasEval:
     """Tests for RAGAS evaluation task firing."""
 
-    @pytest.mark.asyncio
-    async def test_fires_ragas_eval_task(
-        self,
-        handler: ChatHandler,
-        mock_user: MagicMock,
-        mock_session: MagicMock,
-        mock_sources: list[RetrievedSource],
-        mock_manager: MagicMock,
-        mock_db: AsyncMock,
-    ) -> None:
-        """Verify maybe_evaluate_async is called with correct parameters."""
-        mock_trace = MagicMock()
-        mock_trace.id = "trace-456"
-        mock_span = MagicMock()
-        mock_trace.span.return_value = mock_span
-        mock_gen = MagicMock()
-        mock_trace.generation.return_value = mock_gen
-
-        mock_user_msg = MagicMock()
-        mock_user_msg.id = 10
-        mock_assistant_msg = MagicMock()
-        mock_assistant_msg.id = 11
-
-        with (
-            patch("api.websocket.chat_handler.create_trace", return_value=mock_trace),
-            patch("api.websocket.chat_handler.get_qdrant", return_value=MagicMock()),
-            patch("api.websocket.chat_handler.get_embedder_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.get_llm_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.ChatService") as mock_service_cls,
-            patch(
-                "api.websocket.chat_handler.maybe_evaluate_async",
-                new_callable=AsyncMock,
-            ) as mock_eval,
-        ):
-            service = mock_service_cls.return_value
-            service.get_session = AsyncMock(return_value=mock_session)
-            service.retrieve_context = AsyncMock(return_value=mock_sources)
-            service.get_document_titles = AsyncMock(return_value={})
-            service.save_user_message = AsyncMock(return_value=mock_user_msg)
-            service.save_assistant_message = AsyncMock(return_value=mock_assistant_msg)
-
-            async def mock_stream(**kwargs):
-                yield "response text"
-
-            service.stream_response = mock_stream
-
-            # Patch asyncio.create_task to capture the coroutine
-            created_tasks = []
-            original_create_task = asyncio.create_task
-
-            def capture_create_task(coro, **kwargs):
-                task = original_create_task(coro, **kwargs)
-                created_tasks.append(task)
-                return task
-
-            with patch("api.websocket.chat_handler.asyncio.create_task", side_effect=capture_create_task):
-                await handler._process_chat(mock_user, session_id=1, query="test query", mode="chat")
-
-            # Wait for the eval task to complete
-            if created_tasks:
-                await asyncio.gather(*created_tasks, return_exceptions=True)
-
-            # Verify maybe_evaluate_async was called
-            mock_eval.assert_called_once_with(
-                trace_id="trace-456",
-                query="test query",
-                response="response text",
-                contexts=[
-                    "Test content for retrieval.",
-                    "More test content.",
-                ],
-                llm_config={
-                    "endpoint": "http://tgi:8080",
-                    "model_id": "llama-3-70b",
-                    "api_key": "test-key",
-                },
-            )
-
-    @pytest.mark.asyncio
     async def test_no_ragas_eval_in_search_mode(
         self,
+        patched_handler_deps: SimpleNamespace,
+        trace_mocks: SimpleNamespace,
         handler: ChatHandler,
-        mock_user: MagicMock,
-        mock_session: MagicMock,
+        mock_user: SimpleNamespace,
+        mock_session: SimpleNamespace,
         mock_sources: list[RetrievedSource],
         mock_manager: MagicMock,
         mock_db: AsyncMock,
     ) -> None:
         """Verify RAGAS evaluation is not triggered in search mode."""
-        mock_trace = MagicMock()
-        mock_trace.id = "trace-123"
-        mock_span = MagicMock()
-        mock_trace.span.return_value = mock_span
-
         mock_user_msg = MagicMock()
         mock_user_msg.id = 10
 
-        with (
-            patch("api.websocket.chat_handler.create_trace", return_value=mock_trace),
-            patch("api.websocket.chat_handler.get_qdrant", return_value=MagicMock()),
-            patch("api.websocket.chat_handler.get_embedder_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.get_llm_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.ChatService") as mock_service_cls,
-            patch(
-                "api.websocket.chat_handler.maybe_evaluate_async",
-                new_callable=AsyncMock,
-            ) as mock_eval,
-        ):
-            service = mock_service_cls.return_value
-            service.get_session = AsyncMock(return_value=mock_session)
-            service.retrieve_context = AsyncMock(return_value=mock_sources)
-            service.get_document_titles = AsyncMock(return_value={})
-            service.save_user_message = AsyncMock(return_value=mock_user_msg)
-
-            await handler._process_chat(mock_user, session_id=1, query="test", mode="search")
-
-            mock_eval.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_llm_config_none_when_no_assistant_llm(
-        self,
-        handler: ChatHandler,
-        mock_user: MagicMock,
-        mock_sources: list[RetrievedSource],
-        mock_manager: MagicMock,
-        mock_db: AsyncMock,
-    ) -> None:
-        """Verify llm_config is None when session has no assistant LLM."""
-        # Session without assistant
-        mock_session = MagicMock()
-        mock_session.id = 1
-        mock_session.assistant = None
+        mock_eval = patched_handler_deps.maybe_evaluate
 
-        mock_trace = MagicMock()
-        mock_trace.id = "trace-789"
-        mock_span = MagicMock()
-        mock_trace.span.return_value = mock_span
-        mock_gen = MagicMock()
-        mock_trace.generation.return_value = mock_gen
+        patched_handler_deps.service_cls.return_value = _FakeChatService(
+            session=mock_session,
+            sources=mock_sources,
+            user_message=mock_user_msg,
+        )
 
-        mock_user_msg = MagicMock()
-        mock_user_msg.id = 10
-        mock_assistant_msg = MagicMock()
-        mock_assistant_msg.id = 11
+        await handler._process_chat(mock_user, session_id=1, query="test", mode="search")
+
+        mock_eval.assert_not_called()
 
-        with (
-            patch("api.websocket.chat_handler.create_trace", return_value=mock_trace),
-            patch("api.websocket.chat_handler.get_qdrant", return_value=MagicMock()),
-            patch("api.websocket.chat_handler.get_embedder_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.get_llm_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.ChatService") as mock_service_cls,
-            patch(
-                "api.websocket.chat_handler.maybe_evaluate_async",
-                new_callable=AsyncMock,
-            ) as mock_eval,
-        ):
-            service = mock_service_cls.return_value
-            service.get_session = AsyncMock(return_value=mock_session)
-            service.retrieve_context = AsyncMock(return_value=mock_sources)
-            service.get_document_titles = AsyncMock(return_value={})
-            service.save_user_message = AsyncMock(return_value=mock_user_msg)
-            service.save_assistant_message = AsyncMock(return_value=mock_assistant_msg)
-
-            async def mock_stream(**kwargs):
-                yield "response"
-
-            service.stream_response = mock_stream
-
-            created_tasks = []
-            original_create_task = asyncio.create_task
-
-            def capture_create_task(coro, **kwargs):
-                task = original_create_task(coro, **kwargs)
-                created_tasks.append(task)
-                return task
-
-            with patch("api.websocket.chat_handler.asyncio.create_task", side_effect=capture_create_task):
-                await handler._process_chat(mock_user, session_id=1, query="test", mode="chat")
-
-            if created_tasks:
-                await asyncio.gather(*created_tasks, return_exceptions=True)
-
-            mock_eval.assert_called_once_with(
-                trace_id="trace-789",
-                query="test",
-                response="response",
-                contexts=[
-                    "Test content for retrieval.",
-                    "More test content.",
-                ],
-                llm_config=None,
-            )
-
-
-class TestChatHandlerTokenStreaming:
-    """Tests for token streaming with Langfuse generation tracking."""
-
-    @pytest.mark.asyncio
-    async def test_tokens_sent_to_client(
+    @pytest.mark.parametrize("trace_mocks", ["trace-789"], indirect=True)
+    async def test_llm_config_none_when_no_assistant_llm(
         self,
+        patched_handler_deps: SimpleNamespace,
+        trace_mocks: SimpleNamespace,
         handler: ChatHandler,
-        mock_user: MagicMock,
-        mock_session: MagicMock,
+        mock_user: SimpleNamespace,
         mock_sources: list[RetrievedSource],
         mock_manager: MagicMock,
         mock_db: AsyncMock,
     ) -> None:
-        """Verify tokens are sent to client via WebSocket."""
-        mock_trace = MagicMock()
-        mock_trace.id = "trace-123"
-        mock_span = MagicMock()
-        mock_trace.span.return_value = mock_span
-        mock_gen = MagicMock()
-        mock_trace.generation.return_value = mock_gen
+        """Verify llm_config is None when session has no assistant LLM."""
+        # Session without assistant
+        mock_session = SimpleNamespace(id=1, assistant=None)
 
         mock_user_msg = MagicMock()
         mock_user_msg.id = 10
         mock_assistant_msg = MagicMock()
         mock_assistant_msg.id = 11
 
-        with (
-            patch("api.websocket.chat_handler.create_trace", return_value=mock_trace),
-            patch("api.websocket.chat_handler.get_qdrant", return_value=MagicMock()),
-            patch("api.websocket.chat_handler.get_embedder_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.get_llm_client", return_value=AsyncMock()),
-            patch("api.websocket.chat_handler.ChatService") as mock_service_cls,
-            patch("api.websocket.chat_handler.maybe_evaluate_async", new_callable=AsyncMock),
-        ):
-            service = mock_service_cls.return_value
-            service.get_session = AsyncMock(return_value=mock_session)
-            service.retrieve_context = AsyncMock(return_value=mock_sources)
-            service.get_document_titles = AsyncMock(return_value={})
-            service.save_user_message = AsyncMock(return_value=mock_user_msg)
-            service.save_assistant_message = AsyncMock(return_value=mock_assistant_msg)
-
-            tokens = ["Hello", " ", "world"]
-
-            async def mock_stream(**kwargs):
-                for t in tokens:
-                    yield t
-
-            service.stream_response = mock_stream
-
-            await handler._process_chat(mock_user, session_id=1, query="test", mode="chat")
-
-            # Check GENERATION_TOKEN messages were sent
-            token_calls = [
-                call
-                for call in mock_manager.send_to_user.call_args_list
-                if call[0][1].get("type") == MessageType.GENERATION_TOKEN
-            ]
-            assert len(token_calls) == 3
-
-            # Check GENERATION_COMPLETE was sent
-            complete_calls = [
-                call
-                for call in mock_manager.send_to_user.call_args_list
-                if call[0][1].get("type") == MessageType.GENERATION_COMPLETE
-            ]
-            assert len(complete_calls) == 1
-            assert complete_calls[0][0][1]["token_count"] == 3
+        mock_eval = patched_handler_deps.maybe_evaluate
+
+        patched_handler_deps.service_cls.return_value = _FakeChatService(
+            session=mock_session,
+            sources=mock_sources,
+            user_message=mock_user_msg,
+            assistant_message=mock_assistant_msg,
+            tokens=("response",),
+        )
+
+        await handler._process_chat(mock_user, session_id=1, query="test", mode="chat")
+        # Let the fire-and-forget evaluation task run on the next loop tick
+        await asyncio.sleep(0)
+
+        mock_eval.assert_awaited_once_with(
+            trace_id="trace-789",
+            query="test",
+            response="response",
+            contexts=[
+                "Test content for retrieval.",
+                "More test content.",
+            ],
+            llm_config=None,
+        )
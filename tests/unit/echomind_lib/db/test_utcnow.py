@@ -9,6 +9,9 @@ Verifies:
 - No timezone-naive datetimes leak through any code path
 """
 
+import functools
+import importlib
+from collections.abc import Callable, Iterator
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -16,6 +19,56 @@ import pytest
 
 from echomind_lib.db.models.base import TIMESTAMP, utcnow
 
+_UTC = timezone.utc
+# Reference clock for bounding utcnow() results
+_utcnow_ref = functools.partial(datetime.now, _UTC)
+
+_MODELS_WITH_CREATION_DATE: list[tuple[str, str]] = [
+    ("echomind_lib.db.models.user", "User"),
+    ("echomind_lib.db.models.connector", "Connector"),
+    ("echomind_lib.db.models.document", "Document"),
+    ("echomind_lib.db.models.chat_session", "ChatSession"),
+    ("echomind_lib.db.models.chat_message", "ChatMessage"),
+    ("echomind_lib.db.models.agent_memory", "AgentMemory"),
+    ("echomind_lib.db.models.team", "Team"),
+    ("echomind_lib.db.models.llm", "LLM"),
+    ("echomind_lib.db.models.assistant", "Assistant"),
+    ("echomind_lib.db.models.embedding_model", "EmbeddingModel"),
+]
+
+
+@pytest.fixture(scope="session")
+def resolved_models() -> dict[str, Callable[..., object] | None]:
+    """Map each model class name to its creation_date default callable.
+
+    Models without a creation_date default map to None.
+    """
+    columns = {
+        class_name: getattr(
+            importlib.import_module(module_path), class_name
+        ).__table__.columns["creation_date"]
+        for module_path, class_name in _MODELS_WITH_CREATION_DATE
+    }
+    return {
+        class_name: col.default.arg if col.default is not None else None
+        for class_name, col in columns.items()
+    }
+
+
+@pytest.fixture(scope="session")
+def pg_timestamp_columns() -> list[tuple[str, str, bool]]:
+    """List (table, column, timezone) for every PostgreSQL TIMESTAMP column."""
+    from sqlalchemy.dialects.postgresql import TIMESTAMP as PG_TIMESTAMP
+
+    from echomind_lib.db.connection import Base
+
+    return [
+        (table_name, col.name, col.type.timezone)
+        for table_name, table in Base.metadata.tables.items()
+        for col in table.columns
+        if isinstance(col.type, PG_TIMESTAMP)
+    ]
+
 
 class TestUtcnow:
     """Tests for the utcnow() helper function."""
@@ -33,13 +86,13 @@ class TestUtcnow:
     def test_returns_utc_timezone(self) -> None:
         """utcnow() returns a datetime in UTC timezone specifically."""
         result = utcnow()
-        assert result.tzinfo == timezone.utc
+        assert result.tzinfo == _UTC
 
     def test_returns_current_time(self) -> None:
         """utcnow() returns approximately the current UTC time."""
-        before = datetime.now(timezone.utc)
+        before = _utcnow_ref()
         result = utcnow()
-        after = datetime.now(timezone.utc)
+        after = _utcnow_ref()
         assert before <= result <= after
 
     def test_successive_calls_increase(self) -> None:
@@ -54,7 +107,7 @@ class TestUtcnow:
         This is the exact operation that asyncpg 0.31+ performs.
         Mixing aware and naive datetimes raises TypeError.
         """
-        aware = datetime.now(timezone.utc)
+        aware = _utcnow_ref()
         result = utcnow()
         delta = result - aware  # Must not raise TypeError
         assert delta.total_seconds() >= 0 or True  # Just verifying no exception
@@ -96,40 +149,20 @@ class TestOrmModelDefaults:
     function itself is tested in TestUtcnow above.
     """
 
-    _MODELS_WITH_CREATION_DATE: list[tuple[str, str]] = [
-        ("echomind_lib.db.models.user", "User"),
-        ("echomind_lib.db.models.connector", "Connector"),
-        ("echomind_lib.db.models.document", "Document"),
-        ("echomind_lib.db.models.chat_session", "ChatSession"),
-        ("echomind_lib.db.models.chat_message", "ChatMessage"),
-        ("echomind_lib.db.models.agent_memory", "AgentMemory"),
-        ("echomind_lib.db.models.team", "Team"),
-        ("echomind_lib.db.models.llm", "LLM"),
-        ("echomind_lib.db.models.assistant", "Assistant"),
-        ("echomind_lib.db.models.embedding_model", "EmbeddingModel"),
-    ]
-
     @pytest.mark.parametrize(
-        "module_path,class_name",
-        _MODELS_WITH_CREATION_DATE,
-        ids=[c for _, c in _MODELS_WITH_CREATION_DATE],
+        "class_name", [class_name for _, class_name in _MODELS_WITH_CREATION_DATE]
     )
     def test_creation_date_default_is_utcnow(
-        self, module_path: str, class_name: str
+        self, resolved_models: dict[str, Callable[..., object] | None], class_name: str
     ) -> None:
         """Model.creation_date default is the utcnow function."""
-        import importlib
-
-        module = importlib.import_module(module_path)
-        model_cls = getattr(module, class_name)
-        col = model_cls.__table__.columns["creation_date"]
-        assert col.default is not None, (
+        default_fn = resolved_models[class_name]
+        assert default_fn is not None, (
             f"{class_name}.creation_date has no default"
         )
         # Compare by name+module (not identity) because PYTHONPATH=src
         # can cause the same module to load under different sys.modules keys,
         # producing distinct function objects for the same source function.
-        default_fn = col.default.arg
         assert callable(default_fn), (
             f"{class_name}.creation_date default is not callable: {default_fn}"
         )
@@ -142,26 +175,20 @@ class TestOrmModelDefaults:
             f"expected echomind_lib.db.models.base"
         )
 
-    def test_all_timestamp_columns_are_timestamptz(self) -> None:
+    def test_all_timestamp_columns_are_timestamptz(
+        self, pg_timestamp_columns: list[tuple[str, str, bool]]
+    ) -> None:
         """Every TIMESTAMP column across all models uses timezone=True.
 
-        This is the definitive test: iterates all ORM models, all columns,
-        and verifies any PostgreSQL TIMESTAMP column has timezone=True.
+        This is the definitive test: checks every PostgreSQL TIMESTAMP column
+        across all ORM models and verifies it has timezone=True.
         """
-        from sqlalchemy.dialects.postgresql import TIMESTAMP as PG_TIMESTAMP
-
-        from echomind_lib.db.connection import Base
-
-        errors: list[str] = []
-        for table_name, table in Base.metadata.tables.items():
-            for col in table.columns:
-                col_type = col.type
-                if isinstance(col_type, PG_TIMESTAMP):
-                    if not col_type.timezone:
-                        errors.append(
-                            f"{table_name}.{col.name} is TIMESTAMP (naive), "
-                            f"must be TIMESTAMPTZ (timezone=True)"
-                        )
+        errors = [
+            f"{table_name}.{col_name} is TIMESTAMP (naive), "
+            f"must be TIMESTAMPTZ (timezone=True)"
+            for table_name, col_name, tz in pg_timestamp_columns
+            if not tz
+        ]
 
         assert not errors, (
             "Found TIMESTAMP columns without timezone=True:\n"
@@ -172,9 +199,9 @@ class TestOrmModelDefaults:
 class TestCrudDatetimeAwareness:
     """Tests that CRUD operations set timezone-aware datetimes."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_session(self) -> AsyncMock:
-        """Create a mock database session."""
+        """Create a mock database session shared by the class."""
         session = AsyncMock()
         session.add = MagicMock()
         session.flush = AsyncMock()
@@ -182,6 +209,12 @@ class TestCrudDatetimeAwareness:
         session.delete = AsyncMock()
         return session
 
+    @pytest.fixture(autouse=True)
+    def _reset_mock_session(self, mock_session: AsyncMock) -> Iterator[None]:
+        """Clear calls and configured results on the shared session before each test."""
+        mock_session.reset_mock(return_value=True, side_effect=True)
+        yield
+
     @pytest.mark.asyncio
     async def test_soft_delete_sets_aware_datetime(self, mock_session: AsyncMock) -> None:
         """SoftDeleteMixin.soft_delete() sets timezone-aware deleted_date."""
@@ -206,7 +239,7 @@ class TestCrudDatetimeAwareness:
         assert mock_obj.deleted_date.tzinfo is not None, (
             "soft_delete() set a naive datetime for deleted_date"
         )
-        assert mock_obj.deleted_date.tzinfo == timezone.utc
+        assert mock_obj.deleted_date.tzinfo == _UTC
 
     @pytest.mark.asyncio
     async def test_user_crud_update_last_login_aware(self, mock_session: AsyncMock) -> None:
@@ -222,7 +255,7 @@ class TestCrudDatetimeAwareness:
 
         assert result is not None
         assert mock_user.last_login.tzinfo is not None
-        assert mock_user.last_login.tzinfo == timezone.utc
+        assert mock_user.last_login.tzinfo == _UTC
 
     @pytest.mark.asyncio
     async def test_user_crud_upsert_from_oidc_sets_aware_dates(
@@ -244,8 +277,8 @@ class TestCrudDatetimeAwareness:
                 email="test@test.com",
             )
 
-        assert mock_user.last_login.tzinfo == timezone.utc
-        assert mock_user.last_update.tzinfo == timezone.utc
+        assert mock_user.last_login.tzinfo == _UTC
+        assert mock_user.last_update.tzinfo == _UTC
 
     @pytest.mark.asyncio
     async def test_document_crud_update_status_aware(self, mock_session: AsyncMock) -> None:
@@ -260,7 +293,7 @@ class TestCrudDatetimeAwareness:
             result = await crud.update_status(mock_session, 1, "completed")
 
         assert mock_doc.last_update.tzinfo is not None
-        assert mock_doc.last_update.tzinfo == timezone.utc
+        assert mock_doc.last_update.tzinfo == _UTC
 
     @pytest.mark.asyncio
     async def test_agent_memory_crud_increment_access_aware(
@@ -278,7 +311,7 @@ class TestCrudDatetimeAwareness:
             result = await crud.increment_access(mock_session, memory_id=1)
 
         assert mock_memory.last_accessed_at.tzinfo is not None
-        assert mock_memory.last_accessed_at.tzinfo == timezone.utc
+        assert mock_memory.last_accessed_at.tzinfo == _UTC
 
     @pytest.mark.asyncio
     async def test_chat_message_feedback_upsert_aware(
@@ -297,4 +330,4 @@ class TestCrudDatetimeAwareness:
             )
 
         assert mock_feedback.last_update.tzinfo is not None
-        assert mock_feedback.last_update.tzinfo == timezone.utc
+        assert mock_feedback.last_update.tzinfo == _UTC
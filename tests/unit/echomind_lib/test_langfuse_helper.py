@@ -7,7 +7,8 @@ score_trace, and error handling.
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import sys
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -24,6 +25,8 @@ from echomind_lib.helpers.langfuse_helper import (
     shutdown_langfuse,
 )
 
+_LANGFUSE_ENV_KEYS = ("LANGFUSE_PUBLIC_KEY", "LANGFUSE_SECRET_KEY", "LANGFUSE_BASE_URL")
+
 
 @pytest.fixture(autouse=True)
 def _reset_module_state() -> None:
@@ -126,106 +129,66 @@ class TestNoOpTrace:
 class TestInitLangfuse:
     """Tests for init_langfuse()."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_langfuse_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Remove Langfuse settings from the environment for each test."""
+        for key in _LANGFUSE_ENV_KEYS:
+            monkeypatch.delenv(key, raising=False)
+
     def test_disabled_when_no_public_key(self) -> None:
         """Returns False and stays disabled when LANGFUSE_PUBLIC_KEY is empty."""
-        with patch.dict("os.environ", {}, clear=True):
-            result = init_langfuse()
-            assert result is False
-            assert is_langfuse_enabled() is False
-            assert get_langfuse() is None
+        result = init_langfuse()
+        assert result is False
+        assert is_langfuse_enabled() is False
+        assert get_langfuse() is None
 
-    def test_disabled_when_no_secret_key(self) -> None:
+    def test_disabled_when_no_secret_key(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Returns False when only public key is set."""
-        with patch.dict(
-            "os.environ",
-            {"LANGFUSE_PUBLIC_KEY": "pk-test"},
-            clear=True,
-        ):
-            result = init_langfuse()
-            assert result is False
-            assert is_langfuse_enabled() is False
-
-    def test_enabled_when_keys_set(self) -> None:
+        monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk-test")
+
+        result = init_langfuse()
+        assert result is False
+        assert is_langfuse_enabled() is False
+
+    def test_enabled_when_keys_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Returns True and enables when both keys are set."""
+        monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk-test")
+        monkeypatch.setenv("LANGFUSE_SECRET_KEY", "sk-test")
+        monkeypatch.setenv("LANGFUSE_BASE_URL", "http://localhost:3000")
         mock_client = MagicMock()
-        with (
-            patch.dict(
-                "os.environ",
-                {
-                    "LANGFUSE_PUBLIC_KEY": "pk-test",
-                    "LANGFUSE_SECRET_KEY": "sk-test",
-                    "LANGFUSE_BASE_URL": "http://localhost:3000",
-                },
-                clear=True,
-            ),
-            patch(
-                "echomind_lib.helpers.langfuse_helper.Langfuse",
-                return_value=mock_client,
-                create=True,
-            ) as mock_cls,
-        ):
-            # Simulate the import inside init_langfuse
-            with patch.dict(
-                "sys.modules",
-                {"langfuse": MagicMock(Langfuse=mock_cls)},
-            ):
-                result = init_langfuse()
-
-                assert result is True
-                assert is_langfuse_enabled() is True
-                assert get_langfuse() is mock_client
-
-    def test_handles_import_error(self) -> None:
+        # Simulate the import inside init_langfuse
+        monkeypatch.setitem(
+            sys.modules, "langfuse", MagicMock(Langfuse=MagicMock(return_value=mock_client))
+        )
+
+        result = init_langfuse()
+
+        assert result is True
+        assert is_langfuse_enabled() is True
+        assert get_langfuse() is mock_client
+
+    def test_handles_import_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Returns False gracefully when langfuse package not installed."""
-        with patch.dict(
-            "os.environ",
-            {
-                "LANGFUSE_PUBLIC_KEY": "pk-test",
-                "LANGFUSE_SECRET_KEY": "sk-test",
-            },
-            clear=True,
-        ):
-            # Force ImportError on `from langfuse import Langfuse`
-            import builtins
-
-            original_import = builtins.__import__
-
-            def mock_import(name: str, *args, **kwargs):
-                if name == "langfuse":
-                    raise ImportError("No module named 'langfuse'")
-                return original_import(name, *args, **kwargs)
-
-            with patch("builtins.__import__", side_effect=mock_import):
-                result = init_langfuse()
-                assert result is False
-                assert is_langfuse_enabled() is False
-
-    def test_handles_initialization_error(self) -> None:
+        monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk-test")
+        monkeypatch.setenv("LANGFUSE_SECRET_KEY", "sk-test")
+        # A None entry makes `from langfuse import Langfuse` raise ImportError
+        monkeypatch.setitem(sys.modules, "langfuse", None)
+
+        result = init_langfuse()
+        assert result is False
+        assert is_langfuse_enabled() is False
+
+    def test_handles_initialization_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Returns False when Langfuse constructor raises."""
-        with patch.dict(
-            "os.environ",
-            {
-                "LANGFUSE_PUBLIC_KEY": "pk-test",
-                "LANGFUSE_SECRET_KEY": "sk-test",
-            },
-            clear=True,
-        ):
-            mock_langfuse_module = MagicMock()
-            mock_langfuse_module.Langfuse.side_effect = RuntimeError("Connection failed")
-
-            import builtins
-
-            original_import = builtins.__import__
-
-            def mock_import(name: str, *args, **kwargs):
-                if name == "langfuse":
-                    return mock_langfuse_module
-                return original_import(name, *args, **kwargs)
-
-            with patch("builtins.__import__", side_effect=mock_import):
-                result = init_langfuse()
-                assert result is False
-                assert is_langfuse_enabled() is False
+        monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk-test")
+        monkeypatch.setenv("LANGFUSE_SECRET_KEY", "sk-test")
+        mock_langfuse_module = MagicMock()
+        mock_langfuse_module.Langfuse.side_effect = RuntimeError("Connection failed")
+        monkeypatch.setitem(sys.modules, "langfuse", mock_langfuse_module)
+
+        result = init_langfuse()
+        assert result is False
+        assert is_langfuse_enabled() is False
 
 
 class TestShutdownLangfuse:
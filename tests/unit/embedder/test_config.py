@@ -8,13 +8,21 @@ import pytest
 from embedder.config import EmbedderSettings, get_settings
 
 
+@pytest.fixture(scope="module")
+def default_settings() -> EmbedderSettings:
+    """Build one EmbedderSettings with no EMBEDDER_* overrides for the module."""
+    with pytest.MonkeyPatch.context() as mp:
+        for key in [k for k in os.environ if k.startswith("EMBEDDER_")]:
+            mp.delenv(key)
+        return EmbedderSettings()
+
+
 class TestEmbedderSettings:
     """Tests for EmbedderSettings class."""
 
-    def test_default_values(self) -> None:
+    def test_default_values(self, default_settings: EmbedderSettings) -> None:
         """Test that default values are set correctly."""
-        with mock.patch.dict(os.environ, {}, clear=True):
-            settings = EmbedderSettings()
+        settings = default_settings
 
         assert settings.grpc_port == 50051
         assert settings.grpc_max_workers == 10